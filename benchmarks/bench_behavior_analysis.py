@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Behavior analysis microbenchmark - per-tick cost of app/title/task/audio rule
+matching with the compiled rule registry vs. linear substring scans over the
+same tables, plus the cost of a whole BehaviorAnalyzer.analyze_behavior tick.
+
+The linear scans walk DEFAULT_RULES directly, so they leave out the table
+rebuilding the old per-call literals also paid: the speedup shown is a floor.
+"""
+import sys
+import os
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.processing.analysis_rules import DEFAULT_RULES, CompiledRules
+from src.processing.behavior_analyzer import BehaviorAnalyzer
+
+WINDOWS = [
+    ("EXCEL.EXE", "Q3 sales budget.xlsx - Excel"),
+    ("WINWORD.EXE", "Project proposal.docx - Word"),
+    ("chrome.exe", "Inbox - Gmail - Google Chrome"),
+    ("explorer.exe", "Downloads - File Explorer"),
+    ("Code.exe", "behavior_analyzer.py - myproject - Visual Studio Code"),
+    ("slack.exe", "general | team - Slack"),
+    ("Spotify.exe", "Spotify Premium"),
+]
+PATTERNS = ["typing", "clicking", "navigating", "scrolling", "mixed_input", "no_input"]
+TRANSCRIPTS = ["", "please save this", "search for the quarterly numbers", "um okay", "send it to the team"]
+
+def linear_tick(app_window, title, pattern, audio):
+    """The analyzer's previous lookups: ordered substring scans over the tables"""
+    rules = DEFAULT_RULES
+    text = (app_window + ' ' + title).lower()
+    app = 'unknown'
+    for name, keywords in rules['app_patterns'].items():
+        if any(keyword in text for keyword in keywords):
+            app = name
+            break
+    profile = rules['application_profiles'].get(app, rules['default_profile'])
+    task = 'general_usage'
+    for name, patterns in profile['tasks'].items():
+        if pattern in patterns:
+            task = name
+            break
+    title_lower = title.lower()
+    for keyword, enhancement in rules['title_patterns'].get(app, {}).items():
+        if keyword in title_lower:
+            task = enhancement['task']
+            break
+    key = f"{app}_{task}"
+    steps = rules['task_steps'].get(key, [f"Working in {app}", "Performing various actions"])
+    potential = "High" if key in rules['automation_potential']['High'] else (
+        "Medium" if key in rules['automation_potential']['Medium'] else "Low")
+    command = None
+    for word, enhancement in rules['audio_commands'].items():
+        if word in audio:
+            command = enhancement['task_modifier']
+            break
+    return app, task, tuple(steps), potential, command
+
+def compiled_tick(rules, app_window, title, pattern, audio):
+    app = rules.application((app_window + ' ' + title).lower())
+    task = rules.profile(app)[1].get(pattern, 'general_usage')
+    enhancement = rules.title_enhancement(app, title.lower())
+    if enhancement:
+        task = enhancement['task']
+    enhancement = rules.audio_command(audio)
+    return (app, task, tuple(rules.steps(app, task)), rules.potential(app, task),
+            enhancement['task_modifier'] if enhancement else None)
+
+def make_ticks(count, seed):
+    rng = random.Random(seed)
+    return [(*rng.choice(WINDOWS), rng.choice(PATTERNS), rng.choice(TRANSCRIPTS)) for _ in range(count)]
+
+def time_per_call(function, ticks):
+    start = time.perf_counter()
+    for tick in ticks:
+        function(*tick)
+    return (time.perf_counter() - start) / len(ticks)
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure behavior analysis rule matching per tick")
+    parser.add_argument('--ticks', type=int, default=200000, help="Lookups per measurement")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    ticks = make_ticks(args.ticks, args.seed)
+    rules = CompiledRules(DEFAULT_RULES)
+
+    mismatches = sum(1 for tick in ticks[:5000] if linear_tick(*tick) != compiled_tick(rules, *tick))
+    print(f"✅ Compiled rules agree with linear scans on {5000 - mismatches}/5000 ticks")
+
+    linear = time_per_call(linear_tick, ticks)
+    compiled = time_per_call(lambda *tick: compiled_tick(rules, *tick), ticks)
+    rules.app_cache.clear()
+    uncached = time_per_call(lambda *tick: (rules.app_cache.clear(), compiled_tick(rules, *tick)), ticks)
+    print(f"🔎 Linear scans:        {linear * 1e6:.2f}us/tick")
+    print(f"⚡ Compiled rules:      {compiled * 1e6:.2f}us/tick ({linear / compiled:.1f}x)")
+    print(f"⚡ Compiled, no memo:   {uncached * 1e6:.2f}us/tick ({linear / uncached:.1f}x)")
+
+    start = time.perf_counter()
+    for _ in range(100):
+        CompiledRules(DEFAULT_RULES)
+    print(f"🔄 Recompiling all rules (hot reload): {(time.perf_counter() - start) * 10:.2f}ms")
+
+    analyzer = BehaviorAnalyzer()
+    analyzer.rules.path = None  # Built-in rules only; no file checks while timing
+    frames = [({'active_window': window, 'window_title': title, 'mouse_x': 0, 'mouse_y': 0},
+               {'text': audio, 'confidence': 0.9}) for window, title, _, audio in ticks[:20000]]
+    start = time.perf_counter()
+    for screen_data, audio_data in frames:
+        analyzer.analyze_behavior(screen_data, audio_data, [])
+    per_tick = (time.perf_counter() - start) / len(frames)
+    print(f"🧠 analyze_behavior:    {per_tick * 1e6:.1f}us/tick")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Input event memory benchmark - bytes retained and allocated per event for the
+InputEvent dataclass (ISO string + details dict) vs. the slotted InputRecord
+(type code + monotonic_ns), and what that means at sustained input rates.
+"""
+import sys
+import os
+import gc
+import time
+import argparse
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.data.models import InputEvent, InputRecord, EVENT_MOUSE_CLICK, EVENT_KEY_PRESS
+
+def make_dataclass_event(i):
+    if i % 2:
+        return InputEvent(timestamp=datetime.now().isoformat(), event_type="key_press", details={"key": "a"})
+    return InputEvent(
+        timestamp=datetime.now().isoformat(),
+        event_type="mouse_click",
+        details={"x": 100 + i % 1000, "y": 200 + i % 700, "button": "Button.left", "pressed": True}
+    )
+
+def make_record(i):
+    if i % 2:
+        return InputRecord(EVENT_KEY_PRESS, time.monotonic_ns(), code="a")
+    return InputRecord(EVENT_MOUSE_CLICK, time.monotonic_ns(), 100 + i % 1000, 200 + i % 700,
+                       code="Button.left", pressed=True)
+
+def retained_bytes(factory, count):
+    """Bytes held per event when `count` events are kept alive"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    events = [factory(i) for i in range(count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    total = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    del events
+    # The list itself holds one pointer per event
+    return total / count - 8
+
+def creation_cost(factory, count):
+    """Seconds to build one event"""
+    start = time.perf_counter()
+    for i in range(count):
+        factory(i)
+    return (time.perf_counter() - start) / count
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare input event representations")
+    parser.add_argument('--events', type=int, default=100000, help="Events per measurement")
+    parser.add_argument('--rates', default="100,1000,5000", help="Comma-separated sustained events/s to report")
+    args = parser.parse_args()
+
+    rates = [int(r) for r in args.rates.split(',')]
+    for name, factory in (("InputEvent dataclass", make_dataclass_event), ("InputRecord slots", make_record)):
+        per_event = retained_bytes(factory, args.events)
+        cost = creation_cost(factory, args.events)
+        print(f"📦 {name}: {per_event:.0f} bytes/event retained, {cost * 1e6:.2f}us to build")
+        for rate in rates:
+            print(f"   {rate:>6}/s: {per_event * rate / 1024:>8.1f} KiB/s allocated, "
+                  f"{cost * rate * 100:.2f}% of one core")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Input event buffer microbenchmark - cost of recording a mouse move with the
+ring buffer vs. the old list append + reslice, while an observer thread keeps
+reading recent events the way the observation loop does.
+
+Runs unpaced (as fast as the producer can go) and at fixed move rates.
+"""
+import sys
+import os
+import time
+import threading
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.data.models import InputEvent
+from src.observation.event_ring_buffer import EventRingBuffer
+
+class ListEventBuffer:
+    """The previous InputTracker storage: append, then reslice past the limit"""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.events = []
+
+    def append(self, event):
+        self.events.append(event)
+        if len(self.events) > self.capacity:
+            self.events = self.events[-self.capacity:]
+
+    def snapshot(self, count):
+        return self.events[-count:] if self.events else []
+
+def run(buffer, events, rate, read_interval):
+    """Produce events on one thread while another reads; return per-append latencies"""
+    running = True
+    reads = [0]
+
+    def reader():
+        while running:
+            buffer.snapshot(10)
+            reads[0] += 1
+            time.sleep(read_interval)
+
+    thread = threading.Thread(target=reader, daemon=True)
+    thread.start()
+
+    latencies = []
+    next_time = time.perf_counter()
+    start = next_time
+    for i in range(events):
+        event = InputEvent(timestamp="", event_type="mouse_move", details={"x": i, "y": i})
+        t0 = time.perf_counter()
+        buffer.append(event)
+        latencies.append(time.perf_counter() - t0)
+        if rate:
+            next_time += 1.0 / rate
+            while time.perf_counter() < next_time:
+                pass
+    elapsed = time.perf_counter() - start
+
+    running = False
+    thread.join()
+    latencies.sort()
+    return {
+        'throughput': events / elapsed,
+        'mean_us': sum(latencies) / len(latencies) * 1e6,
+        'p99_us': latencies[int(len(latencies) * 0.99)] * 1e6,
+        'max_us': latencies[-1] * 1e6,
+        'reads': reads[0]
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare input event buffers under mouse-move load")
+    parser.add_argument('--events', type=int, default=200000, help="Events per run")
+    parser.add_argument('--capacity', type=int, default=1000, help="Events retained")
+    parser.add_argument('--rates', default="0,1000,5000", help="Comma-separated moves/s (0 = unpaced)")
+    parser.add_argument('--read-interval', type=float, default=0.001, help="Seconds between observer reads")
+    args = parser.parse_args()
+
+    for rate in (int(r) for r in args.rates.split(',')):
+        events = args.events if rate == 0 else min(args.events, rate * 5)
+        label = "unpaced" if rate == 0 else f"{rate}/s"
+        for name, buffer in (("list", ListEventBuffer(args.capacity)), ("ring", EventRingBuffer(args.capacity))):
+            result = run(buffer, events, rate, args.read_interval)
+            print(f"🖱️ {label:>8} {name}: {result['throughput']:>10,.0f} events/s, "
+                  f"append mean {result['mean_us']:.2f}us p99 {result['p99_us']:.2f}us "
+                  f"max {result['max_us']:.0f}us, {result['reads']} reads")
+
+if __name__ == "__main__":
+    main()
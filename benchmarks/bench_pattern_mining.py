@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Sequential pattern mining benchmark - per-action cost, memory bound and
+recall of PatternDetector on synthetic action streams of millions of actions.
+
+The stream is random (app, input pattern, audio intent) noise with a few
+planted routines spliced in, each occasionally interrupted by one stray
+action (a gap the miner must tolerate). Reports throughput at checkpoints,
+how many candidates lossy counting keeps, and whether every planted routine
+is found.
+"""
+import sys
+import os
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.processing.pattern_detector import PatternDetector
+
+APPS = ['excel', 'word', 'chrome', 'explorer', 'vscode', 'outlook', 'notepad', 'unknown']
+INPUT_PATTERNS = ['typing', 'clicking', 'navigating', 'scrolling', 'mixed_input', 'no_input']
+INTENTS = ['', '', '', '', 'opening', 'saving', 'searching', 'sending']
+
+def make_routines(rng, count, length):
+    """Random routines; no action directly repeats, since the detector merges repeats into one step"""
+    routines = []
+    for _ in range(count):
+        routine = []
+        while len(routine) < length:
+            action = (rng.choice(APPS), rng.choice(INPUT_PATTERNS), rng.choice(INTENTS))
+            if not routine or action != routine[-1]:
+                routine.append(action)
+        routines.append(tuple(routine))
+    return routines
+
+def action_stream(rng, total, routines, routine_rate, interrupt_rate):
+    """Yield `total` actions: noise with routines spliced in"""
+    produced = 0
+    while produced < total:
+        if rng.random() < routine_rate:
+            for i, action in enumerate(rng.choice(routines)):
+                if i and rng.random() < interrupt_rate:
+                    yield (rng.choice(APPS), rng.choice(INPUT_PATTERNS), '')
+                    produced += 1
+                yield action
+                produced += 1
+        else:
+            yield (rng.choice(APPS), rng.choice(INPUT_PATTERNS), rng.choice(INTENTS))
+            produced += 1
+
+def table_bytes(detector, sample=1000):
+    """Approximate memory held by the candidate table"""
+    entries = list(detector.counts.items())[:sample]
+    if not entries:
+        return sys.getsizeof(detector.counts)
+    per_entry = sum(sys.getsizeof(key) + sys.getsizeof(entry) + sum(sys.getsizeof(value) for value in entry)
+                    for key, entry in entries) / len(entries)
+    return sys.getsizeof(detector.counts) + per_entry * len(detector.counts)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark incremental sequential pattern mining")
+    parser.add_argument('--actions', type=int, default=2000000, help="Actions in the synthetic stream")
+    parser.add_argument('--routines', type=int, default=5, help="Planted routines")
+    parser.add_argument('--routine-length', type=int, default=4, help="Steps per planted routine")
+    parser.add_argument('--routine-rate', type=float, default=0.02, help="Chance each step starts a routine")
+    parser.add_argument('--interrupt-rate', type=float, default=0.1, help="Chance of a stray action inside a routine")
+    parser.add_argument('--max-length', type=int, default=5)
+    parser.add_argument('--max-gap', type=int, default=1)
+    parser.add_argument('--prune-interval', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    routines = make_routines(rng, args.routines, args.routine_length)
+    detector = PatternDetector(max_length=args.max_length, max_gap=args.max_gap,
+                               prune_interval=args.prune_interval)
+
+    checkpoints = {args.actions * i // 10 for i in range(1, 11)}
+    peak_bytes = 0
+    start = time.perf_counter()
+    last_time, last_count = start, 0
+    for count, action in enumerate(action_stream(rng, args.actions, routines,
+                                                 args.routine_rate, args.interrupt_rate), 1):
+        detector.add(action)
+        if count in checkpoints:
+            now = time.perf_counter()
+            stats = detector.get_stats()
+            size = table_bytes(detector)
+            peak_bytes = max(peak_bytes, size)
+            print(f"⛏️ {count:>10,} actions: {(now - last_time) / (count - last_count) * 1e6:.2f}us/action, "
+                  f"{stats['tracked_patterns']:,} candidates (~{size / 2**20:.1f} MiB), "
+                  f"{stats['frequent_patterns']:,} frequent")
+            last_time, last_count = time.perf_counter(), count
+    elapsed = time.perf_counter() - start
+
+    stats = detector.get_stats()
+    print(f"📊 {args.actions:,} actions in {elapsed:.1f}s ({args.actions / elapsed:,.0f}/s), "
+          f"largest checkpoint table ~{peak_bytes / 2**20:.1f} MiB, {stats['pruned']:,} candidates pruned")
+
+    # A planted routine is found if it is among the most repeated full-length patterns
+    top = detector.frequent_patterns(min_length=args.routine_length, limit=args.routines * 4)
+    found = {tuple(pattern['steps']): pattern['occurrences'] for pattern in top}
+    for routine in routines:
+        occurrences = found.get(routine)
+        label = ' -> '.join(f"{app}/{pattern}" for app, pattern, _ in routine)
+        if occurrences is None:
+            print(f"❌ Missed routine: {label}")
+        else:
+            print(f"✅ Found routine ({occurrences:,}x): {label}")
+
+if __name__ == "__main__":
+    main()
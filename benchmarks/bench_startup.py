@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark - how long SpeechToText blocks its caller vs. how long the
+model takes to become ready in the background.
+
+Exits non-zero when construction blocks longer than --max-init-ms, so it can
+guard against regressions that put model loading back on the startup path.
+"""
+import sys
+import os
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.processing.speech_to_text import SpeechToText
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure assistant startup cost")
+    parser.add_argument('--model', default=None, help="Whisper model to load (default: WHISPER_MODEL)")
+    parser.add_argument('--max-init-ms', type=float, default=100.0,
+                        help="Fail if SpeechToText() blocks longer than this")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    stt = SpeechToText(args.model) if args.model else SpeechToText()
+    init_ms = (time.perf_counter() - start) * 1000
+
+    stt.wait_until_ready()
+    ready_ms = (time.perf_counter() - start) * 1000
+    status = stt.get_load_status()
+
+    print(f"⏱️ SpeechToText() returned in {init_ms:.1f}ms")
+    print(f"⏱️ Model '{status['model']}' {status['state']} after {ready_ms:.0f}ms")
+
+    if init_ms > args.max_init_ms:
+        print(f"❌ Startup regression: {init_ms:.1f}ms > {args.max_init_ms:.0f}ms")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -14,23 +14,95 @@ for directory in [DATA_DIR, MODELS_DIR, OBSERVATIONS_DIR, WORKFLOWS_DIR]:
 
 # Observation settings
 CAPTURE_INTERVAL = 2.0  # seconds
+CAPTURE_MIN_INTERVAL = 0.5  # seconds, during input bursts and focus changes
+CAPTURE_MAX_INTERVAL = 30.0  # seconds, upper bound of the idle back-off
+CAPTURE_BACKOFF_FACTOR = 1.5  # Interval multiplier per idle tick
+CAPTURE_BURST_EVENTS = 20  # Input events per tick that count as a burst
+WINDOW_EVENTS_ENABLED = True  # Push focus/title changes from X11 instead of polling
+MOUSE_MOVE_COALESCE = True  # Merge runs of pointer motion into single events
+MOUSE_MOVE_COALESCE_MS = 100  # Longest run folded into one move event
+MOUSE_MOVE_COALESCE_PX = 200  # Largest displacement (Manhattan) folded into one move event
+INPUT_STATS_WINDOWS = (1, 10, 60)  # Seconds covered by the sliding input statistics
+INPUT_STATS_RESOLUTION_MS = 100  # Bucket size of the sliding windows
+INPUT_PATTERN_WINDOW = 10  # Window (one of INPUT_STATS_WINDOWS) used to classify input patterns
+INPUT_LOG_ENABLED = True  # Keep a binary log of input events in OBSERVATIONS_DIR/input for replay
 MAX_OBSERVATION_HISTORY = 1000
 SCREEN_CAPTURE_QUALITY = 0.7  # Compression quality
+SCREEN_CHANGE_THRESHOLD = 12  # Largest downsampled grayscale difference (0-255) that counts as a change
+SCREEN_DIFF_SIZE = (64, 36)  # Downsampled size used for change detection
+SCREEN_CAPTURE_BACKEND = "pyautogui"  # "pyautogui", "mss", "synthetic"
+SCREEN_BUFFER_SIZE = 8  # Frames kept in the in-memory ring buffer
+SCREEN_PERSIST_FRAMES = True  # Write changed frames to OBSERVATIONS_DIR/screenshots
+SCREEN_STORAGE_MODE = "jpeg"  # "jpeg" (one file per frame), "tiles" (keyframes + tile deltas) or "segments" (hourly archive)
+SCREEN_TILE_SIZE = 64  # Pixels; multiple of 16 so tiles align with JPEG blocks
+SCREEN_KEYFRAME_INTERVAL = 30  # Deltas between full keyframes
+SCREEN_KEYFRAME_CHANGE_RATIO = 0.5  # Write a keyframe when more tiles than this changed
+SCREEN_ENCODER_WORKERS = 2  # Background encoder threads (0 = encode on the capture thread)
+SCREEN_ENCODER_QUEUE = 4  # Frames waiting for encoding before the policy applies
+SCREEN_ENCODER_POLICY = "drop_oldest"  # "drop_oldest" or "skip" when the encoders fall behind
 
 # Audio settings
 AUDIO_CHUNK = 1024
 AUDIO_CHANNELS = 1
 AUDIO_FORMAT = 'pyaudio.paInt16'
 AUDIO_RATE = 16000
+AUDIO_DEVICE_RATE = None  # Native rate for devices without 16 kHz support (e.g. 48000); resampled to AUDIO_RATE
 AUDIO_RECORD_SECONDS = 10
+AUDIO_STREAMING = True  # Queue float32 NumPy segments instead of WAV file paths
+AUDIO_CAPTURE_MODE = "callback"  # "callback" (PortAudio callback + ring buffer) or "blocking" reads
+AUDIO_RING_SECONDS = 5  # Capacity of the callback ring buffer
+AUDIO_SAVE_WAV = False  # Also write each streamed segment to OBSERVATIONS_DIR/audio
+AUDIO_ENDPOINTING = True  # Emit utterances at speaker pauses instead of fixed 10 s chunks
+AUDIO_ENDPOINT_SILENCE_MS = 400  # Pause length that ends an utterance
+AUDIO_MAX_SEGMENT_SECONDS = 10  # Longer utterances are split
+AUDIO_PREROLL_MS = 300  # Audio kept from before speech onset
+AUDIO_SEGMENT_OVERLAP_MS = 500  # Overlap between the pieces of a split utterance
+
+# Voice activity detection settings
+VAD_ENABLED = True  # Skip silent segments before Whisper
+VAD_FRAME_MS = 30
+VAD_ENERGY_THRESHOLD = 0.01  # Minimum frame RMS treated as speech
+VAD_NOISE_RATIO = 3.0  # Speech must be this many times louder than the noise floor
+VAD_ZCR_MAX = 0.35  # Frames with more zero crossings are treated as noise
+VAD_MIN_SPEECH_MS = 250  # Less speech than this and the segment is dropped
+VAD_PADDING_MS = 200  # Silence kept around trimmed speech
+
+# Keyword spotting settings
+KWS_ENABLED = True  # Spot command words in short utterances before running Whisper
+KWS_COMMAND_WORDS = ["open", "save", "create", "search", "send"]
+KWS_MAX_SEGMENT_SECONDS = 1.5  # Longer utterances always get full transcription
+KWS_MATCH_THRESHOLD = 6.0  # Largest normalised DTW distance accepted as a match
+KWS_MARGIN = 0.8  # Best word must be this much closer than the runner-up
+KWS_LENGTH_RATIO = 1.35  # Voiced length may differ from a template by at most this factor (longer means more words)
+KWS_MAX_TEMPLATES = 5  # Most recent enrolled templates kept per word
+KWS_TEMPLATES_FILE = DATA_DIR / "keyword_templates.npz"
 
 # Model settings
 WHISPER_MODEL = "base"  # "tiny", "base", "small", "medium", "large"
+TRANSCRIPTION_WORKERS = 1  # >1 runs that many worker processes, each with its own model
+TRANSCRIPTION_BATCH_SIZE = 4  # Queued segments decoded together in one Whisper pass
+WHISPER_ADAPTIVE = True  # Switch model tiers to keep transcription inside the latency budget
+WHISPER_MODEL_TIERS = ["tiny", "base", "small"]  # Fastest to most accurate
+TRANSCRIPTION_LATENCY_BUDGET = 3.0  # Seconds from a segment being queued to its transcript
+TIER_SWITCH_COOLDOWN = 30.0  # Minimum seconds between tier switches
+TIER_MIN_SAMPLES = 5  # Transcriptions measured on a tier before it can be switched
+TRANSCRIPT_CACHE_ENABLED = True  # Reuse transcripts of repeated audio (silence, ambient noise)
+TRANSCRIPT_CACHE_SIZE = 512  # Entries kept in the LRU
+TRANSCRIPT_CACHE_QUANT_STEP = 1 / 64  # Sample quantisation before fingerprinting
+TRANSCRIPT_CACHE_PERSIST = True  # Keep the cache across sessions
+TRANSCRIPT_CACHE_FILE = DATA_DIR / "transcript_cache.json"
 LLM_MODEL = "microsoft/DialoGPT-medium"
 
 # Automation settings
 AUTOMATION_CONFIDENCE_THRESHOLD = 0.7
-MIN_PATTERN_OCCURRENCES = 3
+MIN_PATTERN_OCCURRENCES = 3  # Non-overlapping repeats before an action sequence counts as a pattern
+PATTERN_MAX_LENGTH = 5  # Longest action sequence mined
+PATTERN_MAX_GAP = 1  # Unrelated actions allowed between consecutive steps of a pattern
+PATTERN_PRUNE_INTERVAL = 10000  # Actions between prunes of rare candidates (lossy counting bucket width)
+
+# Analysis rule settings
+ANALYSIS_RULES_FILE = DATA_DIR / "analysis_rules.json"  # Optional overrides of the built-in app, title and task tables
+ANALYSIS_RULES_RELOAD_INTERVAL = 2.0  # Seconds between checks of the rules file for changes
 
 # Privacy settings
 ENABLE_CLOUD_UPLOAD = False
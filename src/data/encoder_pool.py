@@ -0,0 +1,104 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+class EncoderPool:
+    """Bounded thread pool that encodes and writes frames off the capture thread
+
+    PIL and cv2 release the GIL while encoding, so a few threads overlap well
+    with capture. When the queue is full the `policy` decides what is lost:
+    "drop_oldest" discards the oldest pending frame, "skip" discards the new one.
+    """
+
+    def __init__(self, store, workers=2, max_queue=4, policy="drop_oldest"):
+        self.store = store
+        # Stores that keep keyframe state must see frames in order
+        if getattr(store, 'sequential', False):
+            workers = 1
+        self.max_queue = max(1, max_queue)
+        self.policy = policy
+        self.pending = deque()
+        self.condition = threading.Condition()
+        self.running = True
+
+        self.stats = {
+            'submitted': 0,
+            'completed': 0,
+            'dropped': 0,
+            'failed': 0,
+            'max_queue_depth': 0,
+            'encode_time_total': 0.0,
+            'encode_time_max': 0.0
+        }
+
+        self.workers = []
+        for i in range(max(1, workers)):
+            worker = threading.Thread(target=self._worker_loop, name=f"frame-encoder-{i}", daemon=True)
+            worker.start()
+            self.workers.append(worker)
+
+    def save(self, frame, timestamp):
+        """Queue a frame for encoding and return a Future for its path"""
+        future = Future()
+        # The ring buffer slot is reused, so the pool keeps its own copy
+        job = (frame.copy(), timestamp, future)
+
+        with self.condition:
+            self.stats['submitted'] += 1
+            if len(self.pending) >= self.max_queue:
+                self.stats['dropped'] += 1
+                if self.policy == "skip":
+                    future.set_result(None)
+                    return future
+                dropped = self.pending.popleft()
+                dropped[2].set_result(None)
+            self.pending.append(job)
+            self.stats['max_queue_depth'] = max(self.stats['max_queue_depth'], len(self.pending))
+            self.condition.notify()
+        return future
+
+    def _worker_loop(self):
+        while True:
+            with self.condition:
+                while self.running and not self.pending:
+                    self.condition.wait()
+                if not self.pending:
+                    return
+                frame, timestamp, future = self.pending.popleft()
+
+            start = time.perf_counter()
+            try:
+                path = self.store.save(frame, timestamp)
+            except Exception as e:
+                print(f"Frame encode error: {e}")
+                with self.condition:
+                    self.stats['failed'] += 1
+                future.set_result(None)
+                continue
+            elapsed = time.perf_counter() - start
+
+            with self.condition:
+                self.stats['completed'] += 1
+                self.stats['encode_time_total'] += elapsed
+                self.stats['encode_time_max'] = max(self.stats['encode_time_max'], elapsed)
+            future.set_result(path)
+
+    def get_stats(self):
+        """Get queue depth and encode latency metrics"""
+        with self.condition:
+            stats = self.stats.copy()
+            stats['queue_depth'] = len(self.pending)
+        completed = stats['completed']
+        stats['encode_ms_avg'] = stats.pop('encode_time_total') / completed * 1000 if completed else 0.0
+        stats['encode_ms_max'] = stats.pop('encode_time_max') * 1000
+        return stats
+
+    def shutdown(self, wait=True):
+        """Finish queued frames and stop the workers"""
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        if wait:
+            for worker in self.workers:
+                worker.join(timeout=5)
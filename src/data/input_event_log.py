@@ -0,0 +1,263 @@
+import struct
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+import numpy as np
+from src.data.models import InputRecord, EVENT_TYPE_NAMES, clock_anchors
+
+# One fixed-width record per input event. code indexes the string table
+# (key or button name, -1 for none); bit 0 of flags is "pressed".
+RECORD_DTYPE = np.dtype([
+    ('time_ns', '<i8'), ('type', 'u1'), ('flags', 'u1'), ('samples', '<u2'),
+    ('x', '<i4'), ('y', '<i4'), ('code', '<i4'), ('dx', '<i4'), ('dy', '<i4'),
+    ('path_length', '<f4'), ('duration_us', '<u4')
+])
+
+# Header: magic, record size, wall-clock and monotonic anchors (ns) of the writing process
+LOG_MAGIC = b"INPLOG01"
+HEADER_FORMAT = "<8sI4xqq"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+
+def local_offset_ns(epoch_ns):
+    """Local UTC offset in ns at a Unix time in ns"""
+    offset = datetime.fromtimestamp(epoch_ns // 1_000_000_000).astimezone().utcoffset()
+    return int(offset.total_seconds()) * 1_000_000_000
+
+class InputEventLog:
+    """Append-only binary log of input events for one session
+
+    `<name>.evl` holds a header and fixed-width RECORD_DTYPE records;
+    `<name>.str` holds the string table, one name per line, written before
+    any record that refers to it. Records are batched in a preallocated
+    array and written when it fills, and a background thread writes what
+    is pending at least once a second even when input has gone idle.
+    """
+
+    def __init__(self, log_dir, batch_size=256, flush_interval=1.0):
+        self.log_dir = Path(log_dir)
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+
+        self.batch = np.zeros(batch_size, dtype=RECORD_DTYPE)
+        self.pending = 0
+        self.flush_interval = flush_interval
+        self.last_flush = time.monotonic()
+        self.strings = {}
+        self.lock = threading.Lock()
+        self.stats = {'records': 0, 'bytes_written': HEADER_SIZE}
+
+        wall_ns, monotonic_ns = clock_anchors()
+        self.file = self._create_file()
+        self.file.write(struct.pack(HEADER_FORMAT, LOG_MAGIC, RECORD_DTYPE.itemsize, wall_ns, monotonic_ns))
+        self.strings_file = open(self.strings_path, 'x', encoding='utf-8')
+
+        self.closed = threading.Event()
+        self.flusher = threading.Thread(target=self._flush_loop, name="input-log-flush", daemon=True)
+        self.flusher.start()
+
+    def _create_file(self):
+        """Open a new log exclusively; a second session in the same second gets a suffix"""
+        base = f"input_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        for attempt in range(1000):
+            name = base if attempt == 0 else f"{base}_{attempt}"
+            self.path = self.log_dir / f"{name}.evl"
+            self.strings_path = self.log_dir / f"{name}.str"
+            if self.strings_path.exists():
+                continue
+            try:
+                return open(self.path, 'xb')
+            except FileExistsError:
+                continue
+        raise FileExistsError(f"No free input log name for {base}")
+
+    def _flush_loop(self):
+        while not self.closed.wait(self.flush_interval):
+            with self.lock:
+                if self.file is None:
+                    return
+                if self.pending and time.monotonic() - self.last_flush >= self.flush_interval:
+                    self._flush()
+
+    def append(self, event):
+        """Add an InputRecord to the log"""
+        with self.lock:
+            if self.file is None:
+                return
+            # One tuple assignment is much cheaper than setting fields one by one
+            self.batch[self.pending] = (
+                event.time_ns, event.type_code, 1 if event.pressed else 0, min(event.samples, 65535),
+                event.x, event.y, self._string_id(event.code), event.dx, event.dy,
+                event.path_length, event.duration_ns // 1000
+            )
+            self.pending += 1
+            if self.pending == len(self.batch) or time.monotonic() - self.last_flush >= self.flush_interval:
+                self._flush()
+
+    def _string_id(self, value):
+        if value is None:
+            return -1
+        string_id = self.strings.get(value)
+        if string_id is None:
+            string_id = len(self.strings)
+            self.strings[value] = string_id
+            # Newlines would break the table; they never occur in key or button names
+            self.strings_file.write(value.replace('\n', ' ') + '\n')
+            self.strings_file.flush()
+        return string_id
+
+    def _flush(self):
+        if self.pending:
+            data = self.batch[:self.pending].tobytes()
+            self.file.write(data)
+            self.file.flush()
+            self.stats['records'] += self.pending
+            self.stats['bytes_written'] += len(data)
+            self.pending = 0
+        self.last_flush = time.monotonic()
+
+    def flush(self):
+        """Write batched records now"""
+        with self.lock:
+            if self.file is not None:
+                self._flush()
+
+    def close(self):
+        self.closed.set()
+        with self.lock:
+            if self.file is None:
+                return
+            self._flush()
+            self.file.close()
+            self.strings_file.close()
+            self.file = None
+
+    def get_stats(self):
+        with self.lock:
+            return self.stats.copy()
+
+class InputEventLogReader:
+    """Memory-mapped view of an input event log as a NumPy structured array"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            magic, record_size, self.wall_anchor_ns, self.monotonic_anchor_ns = struct.unpack(
+                HEADER_FORMAT, f.read(HEADER_SIZE)
+            )
+        if magic != LOG_MAGIC or record_size != RECORD_DTYPE.itemsize:
+            raise ValueError(f"{self.path} is not an input event log")
+
+        # A record still being written at a crash is ignored
+        count = (self.path.stat().st_size - HEADER_SIZE) // RECORD_DTYPE.itemsize
+        if count > 0:
+            self.records = np.memmap(self.path, dtype=RECORD_DTYPE, mode='r', offset=HEADER_SIZE, shape=(count,))
+        else:
+            self.records = np.zeros(0, dtype=RECORD_DTYPE)
+
+        strings_path = self.path.with_suffix('.str')
+        self.strings = strings_path.read_text(encoding='utf-8').splitlines() if strings_path.exists() else []
+
+        # Records are written in time order; logs from before that was enforced may not be
+        times = self.records['time_ns']
+        self.time_sorted = bool(np.all(times[1:] >= times[:-1])) if len(times) > 1 else True
+
+        # Shift from the writer's monotonic clock to this process's
+        wall_ns, monotonic_ns = clock_anchors()
+        self.clock_offset_ns = (self.wall_anchor_ns - self.monotonic_anchor_ns) - (wall_ns - monotonic_ns)
+
+    def __len__(self):
+        return len(self.records)
+
+    def wall_times(self, records=None):
+        """Local wall-clock times of records as naive datetime64[ns]
+
+        Same time base as select() bounds and InputRecord.timestamp.
+        """
+        records = self.records if records is None else records
+        epoch_ns = records['time_ns'] - self.monotonic_anchor_ns + self.wall_anchor_ns
+        if len(epoch_ns):
+            first, last = local_offset_ns(int(epoch_ns.min())), local_offset_ns(int(epoch_ns.max()))
+            if first == last:
+                epoch_ns = epoch_ns + first
+            else:
+                # The log spans a daylight saving change
+                epoch_ns = epoch_ns + np.fromiter((local_offset_ns(int(t)) for t in epoch_ns),
+                                                  dtype=np.int64, count=len(epoch_ns))
+        return epoch_ns.astype('datetime64[ns]')
+
+    def select(self, event_type=None, start=None, end=None):
+        """Records of one type (name or code) between two datetimes, as a view where possible"""
+        records = self.records
+        if start is not None or end is not None:
+            times = records['time_ns']
+            if self.time_sorted:
+                lo = 0 if start is None else np.searchsorted(times, self._to_monotonic(start), 'left')
+                hi = len(records) if end is None else np.searchsorted(times, self._to_monotonic(end), 'right')
+                records = records[lo:hi]
+            else:
+                mask = np.ones(len(records), dtype=bool)
+                if start is not None:
+                    mask &= times >= self._to_monotonic(start)
+                if end is not None:
+                    mask &= times <= self._to_monotonic(end)
+                records = records[mask]
+        if event_type is not None:
+            code = EVENT_TYPE_NAMES.index(event_type) if isinstance(event_type, str) else event_type
+            records = records[records['type'] == code]
+        return records
+
+    def counts_by_type(self, records=None):
+        """Event count per type name"""
+        records = self.records if records is None else records
+        counts = np.bincount(records['type'], minlength=len(EVENT_TYPE_NAMES))
+        return {name: int(counts[code]) for code, name in enumerate(EVENT_TYPE_NAMES)}
+
+    def _to_monotonic(self, when):
+        return int(when.timestamp() * 1e9) - self.wall_anchor_ns + self.monotonic_anchor_ns
+
+    def to_input_record(self, row, time_ns=None):
+        """Rebuild an InputRecord from one structured row, on this process's monotonic clock"""
+        code = int(row['code'])
+        if time_ns is None:
+            time_ns = int(row['time_ns']) + self.clock_offset_ns
+        return InputRecord(
+            int(row['type']), time_ns, int(row['x']), int(row['y']),
+            code=self.strings[code] if 0 <= code < len(self.strings) else None,
+            pressed=bool(row['flags'] & 1), dx=int(row['dx']), dy=int(row['dy']),
+            path_length=float(row['path_length']), duration_ns=int(row['duration_us']) * 1000,
+            samples=int(row['samples'])
+        )
+
+    def replay(self, callback, speed=1.0, records=None):
+        """Call callback(InputRecord) for each record, keeping the original gaps divided by speed
+
+        With speed > 0 records are re-timed as if happening now, so they can
+        drive live consumers such as InputStatistics. speed=0 replays as fast
+        as possible with the original timestamps.
+        """
+        records = self.records if records is None else records
+        if len(records) == 0:
+            return 0
+        start_ns = time.monotonic_ns()
+        first_ns = int(records['time_ns'][0])
+        for row in records:
+            if speed > 0:
+                due_ns = start_ns + int((int(row['time_ns']) - first_ns) / speed)
+                delay = (due_ns - time.monotonic_ns()) / 1e9
+                if delay > 0:
+                    time.sleep(delay)
+                callback(self.to_input_record(row, time_ns=due_ns))
+            else:
+                callback(self.to_input_record(row))
+        return len(records)
+
+def list_input_logs(log_dir):
+    """Session logs in a directory, oldest first"""
+    return sorted(Path(log_dir).glob("input_*.evl"))
+
+def cleanup_input_logs(log_dir, cutoff_ts):
+    """Delete session logs (and their string tables) last written before cutoff_ts"""
+    for path in list_input_logs(log_dir):
+        if path.stat().st_mtime < cutoff_ts:
+            path.unlink()
+            path.with_suffix('.str').unlink(missing_ok=True)
@@ -1,3 +1,4 @@
+import time
 from dataclasses import dataclass
 from typing import List, Dict, Any
 from datetime import datetime
@@ -24,6 +25,87 @@ class InputEvent:
     event_type: str  # 'mouse_click', 'key_press', 'mouse_move'
     details: Dict[str, Any]
 
+# Integer codes for the compact input event representation
+EVENT_MOUSE_MOVE = 0
+EVENT_MOUSE_CLICK = 1
+EVENT_MOUSE_SCROLL = 2
+EVENT_KEY_PRESS = 3
+EVENT_TYPE_NAMES = ("mouse_move", "mouse_click", "mouse_scroll", "key_press")
+EVENT_TYPE_CODES = {name: code for code, name in enumerate(EVENT_TYPE_NAMES)}
+
+# Monotonic timestamps are converted to wall-clock time against this anchor
+_WALL_ANCHOR_NS = time.time_ns()
+_MONOTONIC_ANCHOR_NS = time.monotonic_ns()
+
+def clock_anchors():
+    """(wall-clock ns, monotonic ns) read together at import, for converting timestamps"""
+    return _WALL_ANCHOR_NS, _MONOTONIC_ANCHOR_NS
+
+def monotonic_to_iso(time_ns):
+    """ISO-8601 wall-clock time for a time.monotonic_ns() reading from this process"""
+    return datetime.fromtimestamp((_WALL_ANCHOR_NS + time_ns - _MONOTONIC_ANCHOR_NS) / 1e9).isoformat()
+
+class InputRecord:
+    """Slotted input event: integer type code, one monotonic_ns timestamp, flat fields
+
+    Meaning of the type-specific fields:
+      mouse_move   x/y end point, dx/dy displacement over the run, path_length,
+                   duration_ns and samples for coalesced runs
+      mouse_click  x/y, code (button name), pressed
+      mouse_scroll x/y, dx/dy
+      key_press    code (key)
+
+    `event_type`, `timestamp` and `details` present the same view as
+    InputEvent; strings and dicts are only built when asked for.
+    """
+
+    __slots__ = ('type_code', 'time_ns', 'x', 'y', 'code', 'pressed', 'dx', 'dy',
+                 'path_length', 'duration_ns', 'samples')
+
+    def __init__(self, type_code, time_ns, x=0, y=0, code=None, pressed=False, dx=0, dy=0,
+                 path_length=0.0, duration_ns=0, samples=1):
+        self.type_code = type_code
+        self.time_ns = time_ns
+        self.x = x
+        self.y = y
+        self.code = code
+        self.pressed = pressed
+        self.dx = dx
+        self.dy = dy
+        self.path_length = path_length
+        self.duration_ns = duration_ns
+        self.samples = samples
+
+    @property
+    def event_type(self):
+        return EVENT_TYPE_NAMES[self.type_code]
+
+    @property
+    def timestamp(self):
+        return monotonic_to_iso(self.time_ns)
+
+    @property
+    def details(self):
+        if self.type_code == EVENT_MOUSE_MOVE:
+            duration = self.duration_ns / 1e9
+            return {
+                "x": self.x, "y": self.y,
+                "start_x": self.x - self.dx, "start_y": self.y - self.dy,
+                "path_length": round(self.path_length, 1),
+                "duration_ms": round(duration * 1000, 1),
+                "velocity": round(self.path_length / duration, 1) if duration > 0 else 0.0,
+                "samples": self.samples
+            }
+        if self.type_code == EVENT_MOUSE_CLICK:
+            return {"x": self.x, "y": self.y, "button": self.code, "pressed": self.pressed}
+        if self.type_code == EVENT_MOUSE_SCROLL:
+            return {"x": self.x, "y": self.y, "dx": self.dx, "dy": self.dy}
+        return {"key": self.code}
+
+    def to_dict(self):
+        """Serializable form, with the ISO timestamp"""
+        return {"timestamp": self.timestamp, "event_type": self.event_type, "details": self.details}
+
 @dataclass
 class WorkflowStep:
     action: str
@@ -0,0 +1,15 @@
+from PIL import Image
+from src.config.settings import SCREEN_CAPTURE_QUALITY
+
+class JpegScreenshotStore:
+    """Persist frames as individual JPEG files"""
+    
+    def __init__(self, screenshot_dir):
+        self.screenshot_dir = screenshot_dir
+        self.screenshot_dir.mkdir(parents=True, exist_ok=True)
+    
+    def save(self, frame, timestamp):
+        """Encode a frame and return the path it was written to"""
+        filepath = self.screenshot_dir / f"screenshot_{timestamp}.jpg"
+        Image.fromarray(frame).save(filepath, "JPEG", quality=int(SCREEN_CAPTURE_QUALITY * 100))
+        return str(filepath)
@@ -0,0 +1,145 @@
+import io
+import os
+import threading
+import numpy as np
+from datetime import datetime
+from pathlib import Path
+from PIL import Image
+from src.config.settings import SCREEN_CAPTURE_QUALITY
+
+# One index record per frame: capture time (µs since epoch), byte offset, byte length
+INDEX_DTYPE = np.dtype([('time_us', '<i8'), ('offset', '<u8'), ('length', '<u4')])
+SEGMENT_FORMAT = "%Y%m%d_%H"
+
+def _parse_timestamp(timestamp):
+    """Parse a capture timestamp string into a datetime"""
+    return datetime.strptime(timestamp, "%Y%m%d_%H%M%S_%f")
+
+class SegmentArchive:
+    """Append-only hourly segments of encoded frames with a time index
+
+    Each hour gets a `.seg` file of concatenated JPEGs and a `.idx` file of
+    fixed-width records, so lookups are a binary search and retention deletes
+    whole segments instead of thousands of small files.
+    """
+
+    def __init__(self, archive_dir):
+        self.archive_dir = Path(archive_dir)
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        self.quality = int(SCREEN_CAPTURE_QUALITY * 100)
+        self.lock = threading.Lock()
+        self.segment_name = None
+        self.data_file = None
+        self.index_file = None
+        self._index_cache = {}  # segment name -> (index size, sorted records)
+        self.stats = {'frames': 0, 'bytes_written': 0}
+
+    def save(self, frame, timestamp):
+        """Append a frame to the current segment and return its reference"""
+        captured_at = _parse_timestamp(timestamp)
+        buffer = io.BytesIO()
+        Image.fromarray(frame).save(buffer, "JPEG", quality=self.quality)
+        payload = buffer.getvalue()
+        time_us = int(captured_at.timestamp() * 1_000_000)
+
+        with self.lock:
+            self._open_segment(captured_at.strftime(SEGMENT_FORMAT))
+            offset = self.data_file.tell()
+            self.data_file.write(payload)
+            self.data_file.flush()
+            # Data first, then index, so a crash never indexes missing bytes
+            record = np.array([(time_us, offset, len(payload))], dtype=INDEX_DTYPE)
+            self.index_file.write(record.tobytes())
+            self.index_file.flush()
+            self.stats['frames'] += 1
+            self.stats['bytes_written'] += len(payload) + INDEX_DTYPE.itemsize
+            return f"{self.archive_dir / (self.segment_name + '.seg')}#{offset}"
+
+    def _open_segment(self, segment_name):
+        """Switch append handles to the segment for a capture hour"""
+        if segment_name == self.segment_name:
+            return
+        self.close()
+        self.segment_name = segment_name
+        self.data_file = open(self.archive_dir / f"{segment_name}.seg", 'ab')
+        self.index_file = open(self.archive_dir / f"{segment_name}.idx", 'ab')
+
+    def close(self):
+        """Close the open segment files"""
+        if self.data_file:
+            self.data_file.close()
+            self.index_file.close()
+        self.data_file = None
+        self.index_file = None
+        self.segment_name = None
+
+    def _load_index(self, segment_name):
+        """Load a segment index sorted by time, reusing the cached copy when unchanged"""
+        index_path = self.archive_dir / f"{segment_name}.idx"
+        if not index_path.exists():
+            return np.empty(0, dtype=INDEX_DTYPE)
+        size = index_path.stat().st_size
+        cached = self._index_cache.get(segment_name)
+        if cached and cached[0] == size:
+            return cached[1]
+
+        # Ignore a trailing partial record left by an interrupted write
+        count = size // INDEX_DTYPE.itemsize
+        records = np.fromfile(index_path, dtype=INDEX_DTYPE, count=count)
+        if count > 1 and np.any(np.diff(records['time_us']) < 0):
+            records = records[np.argsort(records['time_us'], kind='stable')]
+        self._index_cache[segment_name] = (size, records)
+        return records
+
+    def _read_payload(self, segment_name, offset, length):
+        with open(self.archive_dir / f"{segment_name}.seg", 'rb') as f:
+            f.seek(offset)
+            return f.read(length)
+
+    def read_frame(self, reference):
+        """Decode the frame behind a reference returned by save()"""
+        path, offset = reference.rsplit('#', 1)
+        segment_name = Path(path).stem
+        records = self._load_index(segment_name)
+        match = records[records['offset'] == int(offset)]
+        if len(match) == 0:
+            return None
+        payload = self._read_payload(segment_name, int(offset), int(match[0]['length']))
+        return np.asarray(Image.open(io.BytesIO(payload)).convert('RGB'))
+
+    def find_frame(self, when):
+        """Get (capture time, frame) for the newest frame at or before a datetime"""
+        time_us = int(when.timestamp() * 1_000_000)
+        for segment_name in reversed(self.list_segments()):
+            if segment_name > when.strftime(SEGMENT_FORMAT):
+                continue
+            records = self._load_index(segment_name)
+            position = np.searchsorted(records['time_us'], time_us, side='right') - 1
+            if position >= 0:
+                record = records[position]
+                payload = self._read_payload(segment_name, int(record['offset']), int(record['length']))
+                frame = np.asarray(Image.open(io.BytesIO(payload)).convert('RGB'))
+                return datetime.fromtimestamp(record['time_us'] / 1_000_000), frame
+        return None
+
+    def get_stats(self):
+        """Get archive write counters"""
+        with self.lock:
+            return self.stats.copy()
+
+    def list_segments(self):
+        """Segment names in chronological order"""
+        return sorted(p.stem for p in self.archive_dir.glob("*.seg"))
+
+def cleanup_segments(archive_dir, cutoff_time):
+    """Delete whole segments whose hour ended before the cutoff datetime"""
+    archive_dir = Path(archive_dir)
+    if not archive_dir.exists():
+        return
+    cutoff_name = cutoff_time.strftime(SEGMENT_FORMAT)
+    for data_path in archive_dir.glob("*.seg"):
+        if data_path.stem < cutoff_name:
+            data_path.unlink()
+            index_path = data_path.with_suffix('.idx')
+            if index_path.exists():
+                os.remove(index_path)
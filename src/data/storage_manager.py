@@ -3,6 +3,9 @@ import os
 from datetime import datetime, timedelta
 from pathlib import Path
 from src.config.settings import OBSERVATIONS_DIR, WORKFLOWS_DIR, MAX_LOCAL_STORAGE_GB
+from src.data.tile_store import cleanup_tile_groups
+from src.data.segment_archive import cleanup_segments
+from src.data.input_event_log import cleanup_input_logs
 
 class StorageManager:
     def __init__(self):
@@ -24,9 +27,20 @@ class StorageManager:
         # Clean up old screenshots
         screenshot_dir = OBSERVATIONS_DIR / "screenshots"
         if screenshot_dir.exists():
-            for file in screenshot_dir.glob("*.jpg"):
+            for file in screenshot_dir.glob("screenshot_*.jpg"):
                 if file.stat().st_mtime < cutoff_time.timestamp():
                     file.unlink()
+            
+            # Keyframes and their tile deltas are removed together
+            cleanup_tile_groups(screenshot_dir, cutoff_time.timestamp())
+            
+            # Archived frames are retired a whole segment at a time
+            cleanup_segments(screenshot_dir / "segments", cutoff_time)
+        
+        # Clean up old input event logs
+        input_dir = OBSERVATIONS_DIR / "input"
+        if input_dir.exists():
+            cleanup_input_logs(input_dir, cutoff_time.timestamp())
         
         # Clean up old audio files
         audio_dir = OBSERVATIONS_DIR / "audio"
@@ -0,0 +1,175 @@
+import io
+import json
+import hashlib
+import numpy as np
+from pathlib import Path
+from PIL import Image
+from src.config.settings import (
+    SCREEN_CAPTURE_QUALITY, SCREEN_TILE_SIZE, SCREEN_KEYFRAME_INTERVAL, SCREEN_KEYFRAME_CHANGE_RATIO
+)
+
+class TileDeltaStore:
+    """Store frames as periodic JPEG keyframes plus changed-tile deltas
+
+    Each delta holds only the tiles that differ from its keyframe, packed into
+    one small JPEG mosaic, so any frame can be rebuilt from two files.
+    """
+    sequential = True  # Deltas depend on the previous keyframe
+
+    def __init__(self, screenshot_dir, tile_size=SCREEN_TILE_SIZE,
+                 keyframe_interval=SCREEN_KEYFRAME_INTERVAL,
+                 keyframe_change_ratio=SCREEN_KEYFRAME_CHANGE_RATIO):
+        self.screenshot_dir = Path(screenshot_dir)
+        self.screenshot_dir.mkdir(parents=True, exist_ok=True)
+        self.tile_size = tile_size
+        self.keyframe_interval = keyframe_interval
+        self.keyframe_change_ratio = keyframe_change_ratio
+        self.quality = int(SCREEN_CAPTURE_QUALITY * 100)
+
+        # Current keyframe state
+        self.keyframe_id = None
+        self.keyframe_shape = None
+        self.keyframe_hashes = None
+        self.frames_since_keyframe = 0
+
+        # Reader cache for the most recently decoded keyframe
+        self._cached_keyframe = (None, None)
+
+        self.stats = {'keyframes': 0, 'deltas': 0, 'tiles_written': 0, 'tiles_total': 0}
+
+    def save(self, frame, timestamp):
+        """Store a frame and return the path of the written file"""
+        hashes = self._tile_hashes(frame)
+        self.stats['tiles_total'] += len(hashes)
+
+        if self._needs_keyframe(frame):
+            return self._write_keyframe(frame, hashes, timestamp)
+
+        changed = [i for i, h in enumerate(hashes) if h != self.keyframe_hashes[i]]
+        if len(changed) > len(hashes) * self.keyframe_change_ratio:
+            return self._write_keyframe(frame, hashes, timestamp)
+
+        return self._write_delta(frame, changed, timestamp)
+
+    def _needs_keyframe(self, frame):
+        return (self.keyframe_id is None
+                or frame.shape != self.keyframe_shape
+                or self.frames_since_keyframe >= self.keyframe_interval)
+
+    def _tile_grid(self, shape):
+        """Number of tile rows and columns covering a frame"""
+        rows = -(-shape[0] // self.tile_size)
+        cols = -(-shape[1] // self.tile_size)
+        return rows, cols
+
+    def _tile_hashes(self, frame):
+        """Hash every tile of a frame in row-major order"""
+        size = self.tile_size
+        rows, cols = self._tile_grid(frame.shape)
+        hashes = []
+        for r in range(rows):
+            band = frame[r * size:(r + 1) * size]
+            for c in range(cols):
+                tile = np.ascontiguousarray(band[:, c * size:(c + 1) * size])
+                hashes.append(hashlib.blake2b(tile, digest_size=8).digest())
+        return hashes
+
+    def _write_keyframe(self, frame, hashes, timestamp):
+        self.keyframe_id = timestamp
+        self.keyframe_shape = frame.shape
+        self.keyframe_hashes = hashes
+        self.frames_since_keyframe = 0
+
+        filepath = self.screenshot_dir / f"key_{timestamp}.jpg"
+        Image.fromarray(frame).save(filepath, "JPEG", quality=self.quality)
+        self.stats['keyframes'] += 1
+        self.stats['tiles_written'] += len(hashes)
+        return str(filepath)
+
+    def _write_delta(self, frame, changed, timestamp):
+        size = self.tile_size
+        cols = self._tile_grid(frame.shape)[1]
+        self.frames_since_keyframe += 1
+
+        # Pack changed tiles side by side into one mosaic (tile edges stay on JPEG block edges)
+        mosaic_cols = max(1, min(len(changed), cols))
+        mosaic_rows = max(1, -(-len(changed) // mosaic_cols))
+        mosaic = np.zeros((mosaic_rows * size, mosaic_cols * size, frame.shape[2]), dtype=np.uint8)
+        for n, index in enumerate(changed):
+            r, c = divmod(index, cols)
+            tile = frame[r * size:(r + 1) * size, c * size:(c + 1) * size]
+            mr, mc = divmod(n, mosaic_cols)
+            mosaic[mr * size:mr * size + tile.shape[0], mc * size:mc * size + tile.shape[1]] = tile
+
+        header = {
+            'keyframe': f"key_{self.keyframe_id}.jpg",
+            'shape': list(frame.shape),
+            'tile_size': size,
+            'tiles': changed,
+            'mosaic_cols': mosaic_cols
+        }
+        buffer = io.BytesIO()
+        if changed:
+            Image.fromarray(mosaic).save(buffer, "JPEG", quality=self.quality)
+
+        filepath = self.screenshot_dir / f"delta_{self.keyframe_id}_{timestamp}.tiles"
+        with open(filepath, 'wb') as f:
+            f.write(json.dumps(header).encode('utf-8') + b'\n')
+            f.write(buffer.getvalue())
+
+        self.stats['deltas'] += 1
+        self.stats['tiles_written'] += len(changed)
+        return str(filepath)
+
+    def read_frame(self, path):
+        """Rebuild the frame stored at a path returned by save()"""
+        path = Path(path)
+        if path.suffix == '.jpg':
+            return self._load_keyframe(path).copy()
+
+        with open(path, 'rb') as f:
+            header = json.loads(f.readline().decode('utf-8'))
+            mosaic_bytes = f.read()
+
+        frame = self._load_keyframe(path.parent / header['keyframe']).copy()
+        if not header['tiles']:
+            return frame
+
+        size = header['tile_size']
+        cols = -(-header['shape'][1] // size)
+        mosaic = np.asarray(Image.open(io.BytesIO(mosaic_bytes)).convert('RGB'))
+        for n, index in enumerate(header['tiles']):
+            r, c = divmod(index, cols)
+            mr, mc = divmod(n, header['mosaic_cols'])
+            target = frame[r * size:(r + 1) * size, c * size:(c + 1) * size]
+            target[:] = mosaic[mr * size:mr * size + target.shape[0], mc * size:mc * size + target.shape[1]]
+        return frame
+
+    def _load_keyframe(self, path):
+        cached_path, cached_frame = self._cached_keyframe
+        if cached_path != str(path):
+            cached_frame = np.asarray(Image.open(path).convert('RGB'))
+            self._cached_keyframe = (str(path), cached_frame)
+        return cached_frame
+
+    def get_stats(self):
+        """Get tile storage counters"""
+        stats = self.stats.copy()
+        total = stats['tiles_total']
+        stats['tile_write_ratio'] = stats['tiles_written'] / total if total else 0.0
+        return stats
+
+def cleanup_tile_groups(screenshot_dir, cutoff_timestamp):
+    """Delete keyframe groups whose newest file is older than the cutoff"""
+    screenshot_dir = Path(screenshot_dir)
+    groups = {}
+    for file in screenshot_dir.glob("key_*.jpg"):
+        groups.setdefault(file.stem[len("key_"):], []).append(file)
+    for file in screenshot_dir.glob("delta_*.tiles"):
+        keyframe_id = file.stem[len("delta_"):].rsplit('_', 3)[0]
+        groups.setdefault(keyframe_id, []).append(file)
+
+    for files in groups.values():
+        if max(f.stat().st_mtime for f in files) < cutoff_timestamp:
+            for f in files:
+                f.unlink()
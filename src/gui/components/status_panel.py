@@ -35,6 +35,14 @@ class StatusPanel(ttk.LabelFrame):
         self.storage_status = ttk.Label(storage_frame, text="Calculating...", style='Status.TLabel')
         self.storage_status.pack(side="left", padx=5)
         
+        # Speech model row
+        speech_frame = ttk.Frame(self, style='Dark.TFrame')
+        speech_frame.pack(fill="x", pady=2)
+        
+        ttk.Label(speech_frame, text="Speech:", style='Status.TLabel', width=12).pack(side="left")
+        self.speech_status = ttk.Label(speech_frame, text="Loading...", style='Yellow.TLabel')
+        self.speech_status.pack(side="left", padx=5)
+        
         # CPU/Memory row
         sys_frame = ttk.Frame(self, style='Dark.TFrame')
         sys_frame.pack(fill="x", pady=2)
@@ -56,6 +64,15 @@ class StatusPanel(ttk.LabelFrame):
         else:
             self.automation_status.config(text="DISABLED", style='Red.TLabel')
         
+        # Update speech model loading state
+        load = self.assistant.transcription_service.get_load_status()
+        if load['state'] == 'ready':
+            self.speech_status.config(text=f"READY ({load['model']})", style='Green.TLabel')
+        elif load['state'] == 'failed':
+            self.speech_status.config(text="FAILED", style='Red.TLabel')
+        else:
+            self.speech_status.config(text=f"LOADING {load['progress']:.0%}", style='Yellow.TLabel')
+        
         # Update storage
         storage_used = self.get_storage_usage()
         self.storage_status.config(text=storage_used)
@@ -1,4 +1,5 @@
 import time
+import queue
 import threading
 import json
 from datetime import datetime
@@ -7,12 +8,12 @@ from pathlib import Path
 from src.observation.screen_capture import ScreenCapture
 from src.observation.audio_capture import AudioCapture
 from src.observation.input_tracker import InputTracker
-from src.processing.speech_to_text import SpeechToText
+from src.observation.capture_scheduler import CaptureScheduler
+from src.processing.transcription_service import TranscriptionService
 from src.processing.behavior_analyzer import BehaviorAnalyzer
 from src.data.storage_manager import StorageManager
 from src.automation.workflow_executor import WorkflowExecutor
 from src.automation.workflow_manager import WorkflowManager
-from src.config.settings import CAPTURE_INTERVAL
 
 class AIAssistant:
     def __init__(self):
@@ -22,12 +23,18 @@ class AIAssistant:
         self.screen_capture = ScreenCapture()
         self.audio_capture = AudioCapture()
         self.input_tracker = InputTracker()
-        self.speech_to_text = SpeechToText()
+        self.transcription_service = TranscriptionService(on_result=self._handle_transcript)
+        self.speech_to_text = self.transcription_service.speech_to_text  # None with worker processes
         self.behavior_analyzer = BehaviorAnalyzer()
         self.storage_manager = StorageManager()
         self.workflow_executor = WorkflowExecutor()
         self.workflow_manager = WorkflowManager()
         
+        # Capture faster while the user is active, back off when idle
+        self.capture_scheduler = CaptureScheduler()
+        self.input_tracker.add_activity_listener(self.capture_scheduler.notify_activity)
+        self.screen_capture.window_state.add_listener(self.capture_scheduler.notify_focus_change)
+        
         self.is_running = False
         self.observation_thread = None
         self.automation_enabled = False
@@ -50,16 +57,20 @@ class AIAssistant:
         # Start all observers
         self.audio_capture.start_recording()
         self.input_tracker.start_tracking()
+        self.screen_capture.window_state.start()
         
         # Start main observation loop
         self.observation_thread = threading.Thread(target=self._observation_loop)
         self.observation_thread.start()
         
-        # Start audio processing thread
+        # Start transcription workers and the audio hand-off thread
+        self.transcription_service.start()
         self.audio_processing_thread = threading.Thread(target=self._audio_processing_loop)
         self.audio_processing_thread.start()
         
         print("🔍 AI Assistant is now observing your desktop...")
+        if not self.transcription_service.is_ready():
+            print("🔄 Speech model still loading - voice commands are buffered until it is ready")
         print("💡 Say commands like 'open Excel' or 'save file'")
         print("⏹️  Press Ctrl+C to stop")
         print("🤖 Use 'enable_automation()' to start auto-executing workflows")
@@ -68,6 +79,7 @@ class AIAssistant:
         """Stop the AI assistant"""
         print("🛑 Stopping AI Assistant...")
         self.is_running = False
+        self.capture_scheduler.wake()
         
         # Stop all components
         self.audio_capture.stop_recording()
@@ -78,7 +90,49 @@ class AIAssistant:
             self.observation_thread.join(timeout=2)
         if self.audio_processing_thread:
             self.audio_processing_thread.join(timeout=2)
-        
+        # Recording flushes its last utterance on the way out, after the
+        # processing loop may already have exited
+        for audio_item in self.audio_capture.get_queued_audio():
+            self._submit_audio(audio_item)
+        self.transcription_service.stop()
+
+        # Report screen change detection savings
+        self.screen_capture.close()
+        capture_stats = self.screen_capture.get_capture_stats()
+        print(f"📸 Screen frames: {capture_stats['frames_captured']} captured, "
+              f"{capture_stats['frames_written']} written, "
+              f"{capture_stats['frames_skipped']} unchanged ({capture_stats['skip_ratio']:.0%} skipped)")
+        if 'encoder' in capture_stats:
+            encoder = capture_stats['encoder']
+            print(f"🗜️ Encoder: {encoder['completed']} encoded, {encoder['dropped']} dropped, "
+                  f"avg {encoder['encode_ms_avg']:.1f}ms, max queue {encoder['max_queue_depth']}")
+        audio_metrics = self.audio_capture.get_capture_metrics()
+        if 'overruns' in audio_metrics:
+            print(f"🎙️ Audio capture: {audio_metrics['overruns']} ring overruns "
+                  f"({audio_metrics['dropped_samples']} samples dropped), "
+                  f"{audio_metrics['input_overflows']} device overflows")
+        transcription = self.transcription_service.get_metrics()
+        print(f"📝 Transcription: {transcription['completed']}/{transcription['submitted']} segments, "
+              f"RTF {transcription['rtf']:.2f} on {transcription['workers']} worker(s)")
+        tiers = self.transcription_service.get_tier_stats()
+        if tiers is not None and tiers['switches']:
+            print(f"🎚️ Whisper tier: {len(tiers['switches'])} switch(es), ended on '{tiers['tier']}'")
+        vad = self.transcription_service.get_vad_stats()
+        if vad is not None:
+            print(f"🔇 VAD: skipped {vad['segments_skipped']}/{vad['segments_total']} segments, "
+                  f"{vad['seconds_skipped']:.0f}s of {vad['seconds_total']:.0f}s audio ({vad['skipped_ratio']:.0%})")
+        cache = self.transcription_service.get_cache_stats()
+        if cache is not None:
+            print(f"🗃️ Transcript cache: {cache['hits']} hits, {cache['misses']} misses "
+                  f"({cache['hit_ratio']:.0%}), {cache['entries']} entries")
+        keywords = self.transcription_service.get_keyword_stats()
+        if keywords is not None:
+            print(f"🔑 Keyword spotting: {keywords['spotted']}/{keywords['checked']} utterances answered "
+                  f"without Whisper, {keywords['enrolled']} templates enrolled")
+        patterns = self.behavior_analyzer.pattern_detector.get_stats()
+        print(f"🔁 Action patterns: {patterns['frequent_patterns']} frequent sequence(s) "
+              f"in {patterns['steps']} steps")
+
         print("✅ AI Assistant stopped!")
     
     def enable_automation(self):
@@ -98,11 +152,16 @@ class AIAssistant:
 
     def _observation_loop(self):
         """Main observation loop"""
+        last_event_count = self.input_tracker.event_count
         while self.is_running:
             try:
                 # Capture screen
                 screen_data = self.screen_capture.capture_screenshot()
                 
+                # Focus changes keep the scheduler at its fastest rate
+                if screen_data and screen_data['focus_changed']:
+                    self.capture_scheduler.notify_focus_change(wake=False)
+                
                 # Get recent input events
                 input_events = self.input_tracker.get_recent_events(10)
                 
@@ -112,7 +171,7 @@ class AIAssistant:
                 # Analyze behavior
                 if screen_data:
                     analysis = self.behavior_analyzer.analyze_behavior(
-                        screen_data, audio_data, input_events
+                        screen_data, audio_data, input_events, self.input_tracker.stats
                     )
                     
                     # Store insights
@@ -125,7 +184,11 @@ class AIAssistant:
                     # Check and execute automation
                     self._check_and_execute_automation(analysis)
                 
-                time.sleep(CAPTURE_INTERVAL)
+                # Wait for the next tick based on input since the last one
+                event_count = self.input_tracker.event_count
+                interval = self.capture_scheduler.next_interval(event_count - last_event_count)
+                last_event_count = event_count
+                self.capture_scheduler.wait(interval)
                 
             except Exception as e:
                 print(f"❌ Observation error: {e}")
@@ -155,45 +218,45 @@ class AIAssistant:
                 print(f"❌ Failed to execute: {workflow_name}")
     
     def _audio_processing_loop(self):
-        """Process audio files in background with context"""
+        """Hand captured audio to the transcription workers with context"""
         while self.is_running:
             try:
-                # Check for new audio files
-                if hasattr(self.audio_capture, 'audio_queue') and not self.audio_capture.audio_queue.empty():
-                    audio_path = self.audio_capture.audio_queue.get()
-                    
-                    # Get conversation context
-                    conversation_context = self.audio_capture.get_conversation_context()
-                    
-                    # Transcribe with context
-                    transcript = self.speech_to_text.transcribe_audio(
-                        audio_path, 
-                        cleanup=True, 
-                        conversation_context=conversation_context
-                    )
-                    
-                    if transcript["text"] and len(transcript["text"].strip()) > 2:
-                        # Update conversation context
-                        self.audio_capture.update_conversation_context(transcript["text"])
-                        self.recent_audio.append(transcript)
-                        print(f"🎤 Voice: '{transcript['text']}'")
-                        
-                        # Show context if available
-                        if transcript.get('has_context'):
-                            context = self.audio_capture.get_conversation_context()
-                            if len(context) > 1:
-                                print(f"   📝 Context: {len(context)} previous utterances")
-                        
-                        # Keep only recent audio
-                        if len(self.recent_audio) > 5:
-                            self.recent_audio = self.recent_audio[-5:]
+                # Block until audio arrives instead of polling once a second
+                try:
+                    audio_item = self.audio_capture.audio_queue.get(timeout=0.5)
+                except queue.Empty:
+                    continue
                 
-                time.sleep(1)
+                self._submit_audio(audio_item)
                 
             except Exception as e:
                 print(f"❌ Audio processing error: {e}")
                 time.sleep(1)
     
+    def _submit_audio(self, audio_item):
+        """Queue a segment for transcription with the current conversation context"""
+        # Workers queue the segment until their model has loaded
+        conversation_context = self.audio_capture.get_conversation_context()
+        self.transcription_service.submit(audio_item, conversation_context)
+    
+    def _handle_transcript(self, transcript):
+        """Apply a transcript to context; called in submission order"""
+        if transcript["text"] and len(transcript["text"].strip()) > 2:
+            # Update conversation context
+            self.audio_capture.update_conversation_context(transcript["text"])
+            self.recent_audio.append(transcript)
+            print(f"🎤 Voice: '{transcript['text']}'")
+            
+            # Show context if available
+            if transcript.get('has_context'):
+                context = self.audio_capture.get_conversation_context()
+                if len(context) > 1:
+                    print(f"   📝 Context: {len(context)} previous utterances")
+            
+            # Keep only recent audio
+            if len(self.recent_audio) > 5:
+                self.recent_audio = self.recent_audio[-5:]
+    
     def _get_latest_audio(self):
         """Get most recent audio transcript"""
         return self.recent_audio[-1] if self.recent_audio else None
@@ -3,29 +3,60 @@ import wave
 import threading
 import queue
 import os
+import numpy as np
 from datetime import datetime
-from src.config.settings import OBSERVATIONS_DIR, AUDIO_CHUNK, AUDIO_CHANNELS, AUDIO_RATE
+from src.config.settings import (
+    OBSERVATIONS_DIR, AUDIO_CHUNK, AUDIO_CHANNELS, AUDIO_RATE, AUDIO_STREAMING, AUDIO_SAVE_WAV,
+    AUDIO_ENDPOINTING, AUDIO_CAPTURE_MODE, AUDIO_RING_SECONDS, AUDIO_DEVICE_RATE
+)
+from src.observation.utterance_segmenter import UtteranceSegmenter
+from src.observation.audio_ring_buffer import AudioRingBuffer
+from src.observation.audio_sources import PyAudioCallbackSource
+from src.observation.audio_resampler import StreamingResampler
 
 class AudioCapture:
-    def __init__(self):
+    def __init__(self, source=None):
         self.audio_dir = OBSERVATIONS_DIR / "audio"
         self.audio_dir.mkdir(exist_ok=True)
         self.audio_queue = queue.Queue()
         self.is_recording = False
+        self.record_thread = None
         self.audio = pyaudio.PyAudio()
         self.conversation_context = []  # Store recent transcripts for context
         self.max_context_length = 5     # Keep last 5 transcripts
         
+        # Devices that can't record 16 kHz are captured natively and resampled
+        self.device_rate = AUDIO_DEVICE_RATE or AUDIO_RATE
+        
+        # Emit utterances at pauses rather than on fixed chunk boundaries
+        self.segmenter = UtteranceSegmenter() if AUDIO_STREAMING and AUDIO_ENDPOINTING else None
+        
+        # Callback capture writes into a preallocated ring; a file or generator
+        # source can stand in for the microphone
+        self.source = source
+        if self.source is None and AUDIO_STREAMING and AUDIO_CAPTURE_MODE == "callback":
+            self.source = PyAudioCallbackSource(self.audio, self.device_rate, AUDIO_CHANNELS, AUDIO_CHUNK)
+        self.ring = None
+        
+        # Fixed-length segment state when endpointing is off
+        self.max_chunks = (AUDIO_RATE // AUDIO_CHUNK) * 10
+        self.segment = None
+        self.segment_position = 0
+        
     def start_recording(self):
         """Start audio recording in separate thread"""
         self.is_recording = True
-        self.record_thread = threading.Thread(target=self._record_audio)
+        target = self._record_from_source if self.source else self._record_audio
+        self.record_thread = threading.Thread(target=target)
         self.record_thread.daemon = True
         self.record_thread.start()
         
     def stop_recording(self):
-        """Stop audio recording"""
+        """Stop audio recording; returns once the utterance in progress is queued"""
         self.is_recording = False
+        if self.record_thread is not None:
+            self.record_thread.join(timeout=2)
+            self.record_thread = None
         
     def _record_audio(self):
         """Continuous audio recording with longer chunks"""
@@ -33,7 +64,7 @@ class AudioCapture:
             stream = self.audio.open(
                 format=pyaudio.paInt16,
                 channels=AUDIO_CHANNELS,
-                rate=AUDIO_RATE,
+                rate=self.device_rate,
                 input=True,
                 frames_per_buffer=AUDIO_CHUNK
             )
@@ -41,13 +72,26 @@ class AudioCapture:
             frames = []
             chunk_count = 0
             max_chunks = (AUDIO_RATE // AUDIO_CHUNK) * 10  # INCREASED to 10 seconds
+            # Read enough device samples for about AUDIO_CHUNK samples after resampling
+            read_size = AUDIO_CHUNK * self.device_rate // AUDIO_RATE
+            chunk_buffer = np.empty(read_size, dtype=np.float32)
+            resampler = StreamingResampler(self.device_rate, AUDIO_RATE) if self.device_rate != AUDIO_RATE else None
             
             while self.is_recording:
                 try:
-                    data = stream.read(AUDIO_CHUNK, exception_on_overflow=False)
-                    frames.append(data)
+                    data = stream.read(read_size, exception_on_overflow=False)
                     chunk_count += 1
                     
+                    if AUDIO_STREAMING:
+                        # Convert each chunk straight into float32 without joining bytes
+                        samples = np.frombuffer(data, dtype=np.int16)
+                        chunk = chunk_buffer[:len(samples)]
+                        np.multiply(samples, np.float32(1 / 32768.0), out=chunk, casting='unsafe')
+                        self._stream_chunk(resampler.process(chunk) if resampler else chunk)
+                        continue
+                    
+                    frames.append(data)
+                    
                     # Save every 10 seconds (DOUBLE the duration)
                     if chunk_count >= max_chunks:
                         self._save_audio_chunk(frames)
@@ -60,10 +104,72 @@ class AudioCapture:
             
             stream.stop_stream()
             stream.close()
+            self._flush_stream()
             
         except Exception as e:
             print(f"Audio setup error: {e}")
     
+    def _record_from_source(self):
+        """Drain the ring buffer filled by a callback, file or generator source"""
+        source_rate = getattr(self.source, 'rate', AUDIO_RATE)
+        self.ring = AudioRingBuffer(int(AUDIO_RING_SECONDS * source_rate))
+        try:
+            self.source.start(self.ring)
+        except Exception as e:
+            print(f"Audio setup error: {e}")
+            return
+        
+        # Resample on this thread, never in the device callback
+        resampler = StreamingResampler(source_rate, AUDIO_RATE) if source_rate != AUDIO_RATE else None
+        chunk_buffer = np.empty(AUDIO_CHUNK * source_rate // AUDIO_RATE, dtype=np.float32)
+        while self.is_recording:
+            count = self.ring.read_into(chunk_buffer, timeout=0.5)
+            if count:
+                chunk = chunk_buffer[:count]
+                self._stream_chunk(resampler.process(chunk) if resampler else chunk)
+            elif self.ring.closed:
+                break  # Finite sources (files, generators) are exhausted
+        
+        self.source.stop()
+        self.ring.close()
+        if resampler is not None:
+            self._stream_chunk(resampler.flush())
+        self._flush_stream()
+    
+    def _stream_chunk(self, chunk):
+        """Route one float32 chunk to the endpointer or the fixed-length segment"""
+        if self.segmenter is not None:
+            for utterance in self.segmenter.push(chunk):
+                self._queue_audio_segment(utterance)
+            return
+        
+        if self.segment is None:
+            self.segment = np.empty(self.max_chunks * AUDIO_CHUNK, dtype=np.float32)
+            self.segment_position = 0
+        count = min(len(chunk), len(self.segment) - self.segment_position)
+        self.segment[self.segment_position:self.segment_position + count] = chunk[:count]
+        self.segment_position += count
+        if self.segment_position >= len(self.segment):
+            self._queue_audio_segment(self.segment)
+            self.segment = None
+            if count < len(chunk):
+                self._stream_chunk(chunk[count:])
+    
+    def _flush_stream(self):
+        """Don't lose an utterance that was still in progress"""
+        if self.segmenter is not None:
+            for utterance in self.segmenter.flush():
+                self._queue_audio_segment(utterance)
+    
+    def get_capture_metrics(self):
+        """Get ring buffer overrun and device overflow counters"""
+        metrics = {'mode': 'callback' if self.source else 'blocking'}
+        if self.ring is not None:
+            metrics.update(self.ring.get_stats())
+        if self.source:
+            metrics.update(self.source.get_stats())
+        return metrics
+    
     def _save_audio_chunk(self, frames):
         """Save audio chunk to file"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
@@ -74,7 +180,7 @@ class AudioCapture:
             wf = wave.open(str(filepath), 'wb')
             wf.setnchannels(AUDIO_CHANNELS)
             wf.setsampwidth(self.audio.get_sample_size(pyaudio.paInt16))
-            wf.setframerate(AUDIO_RATE)
+            wf.setframerate(self.device_rate)
             wf.writeframes(b''.join(frames))
             wf.close()
             
@@ -85,8 +191,28 @@ class AudioCapture:
         except Exception as e:
             print(f"Audio save error: {e}")
     
+    def _queue_audio_segment(self, segment):
+        """Hand a float32 segment to the transcription queue without touching disk"""
+        self.audio_queue.put(segment)
+        if AUDIO_SAVE_WAV:
+            self._write_wav_tap(segment)
+    
+    def _write_wav_tap(self, segment):
+        """Optionally persist a streamed segment as 16-bit WAV"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        filepath = self.audio_dir / f"audio_{timestamp}.wav"
+        try:
+            pcm = (np.clip(segment, -1.0, 1.0) * 32767).astype(np.int16)
+            with wave.open(str(filepath), 'wb') as wf:
+                wf.setnchannels(AUDIO_CHANNELS)
+                wf.setsampwidth(2)
+                wf.setframerate(AUDIO_RATE)
+                wf.writeframes(pcm.tobytes())
+        except Exception as e:
+            print(f"Audio save error: {e}")
+    
     def get_queued_audio(self):
-        """Get audio files from queue for processing"""
+        """Get queued audio (file paths or float32 segments) for processing"""
         audio_files = []
         while not self.audio_queue.empty():
             try:
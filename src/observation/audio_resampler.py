@@ -0,0 +1,87 @@
+from math import gcd
+import numpy as np
+
+class StreamingResampler:
+    """Chunk-wise polyphase FIR resampler (e.g. 48 or 44.1 kHz device audio to 16 kHz)
+
+    The low-pass filter is a Kaiser-windowed sinc designed like
+    scipy.signal.resample_poly's default, split into `up` phases of `taps`
+    coefficients each. Only the last `taps - 1` input samples are carried
+    between chunks, so memory stays bounded however long the stream runs.
+    Output lags the input by half the filter (about 1 ms at 48 kHz).
+    """
+
+    def __init__(self, in_rate, out_rate, beta=5.0):
+        divisor = gcd(int(in_rate), int(out_rate))
+        self.in_rate = in_rate
+        self.out_rate = out_rate
+        self.up = int(out_rate) // divisor
+        self.down = int(in_rate) // divisor
+
+        # Low-pass at the lower of the two Nyquist frequencies, on the upsampled grid
+        half_length = 10 * max(self.up, self.down)
+        n = np.arange(-half_length, half_length + 1)
+        cutoff = 1.0 / max(self.up, self.down)
+        h = cutoff * np.sinc(cutoff * n) * np.kaiser(len(n), beta) * self.up
+
+        self.taps = -(-len(h) // self.up)
+        padded = np.zeros(self.taps * self.up)
+        padded[:len(h)] = h
+        # phases[p, k] weights input sample i0 - k for an output on phase p
+        self.phases = padded.reshape(self.taps, self.up).T.astype(np.float32)
+        self.delay = half_length / self.up  # In input samples
+
+        self.reset()
+
+    def reset(self):
+        """Forget stream history (start of a new recording)"""
+        self.history = np.zeros(self.taps - 1, dtype=np.float32)
+        self.history_start = -(self.taps - 1)  # Absolute index of history[0]
+        self.next_output = 0
+        self.offsets = np.arange(self.taps)
+
+    def process(self, chunk):
+        """Resample the next chunk of float32 samples; returns the output it completes"""
+        buffer = np.concatenate((self.history, np.asarray(chunk, dtype=np.float32)))
+        last_input = self.history_start + len(buffer) - 1
+
+        # Every output whose newest input sample has arrived
+        last_output = ((last_input + 1) * self.up - 1) // self.down
+        outputs = np.arange(self.next_output, last_output + 1, dtype=np.int64)
+        if len(outputs):
+            positions = outputs * self.down
+            newest = positions // self.up - self.history_start
+            windows = buffer[newest[:, None] - self.offsets]
+            result = np.einsum('nk,nk->n', windows, self.phases[positions % self.up]).astype(np.float32)
+            self.next_output = last_output + 1
+        else:
+            result = np.empty(0, dtype=np.float32)
+
+        keep = self.taps - 1
+        self.history = buffer[len(buffer) - keep:] if keep else buffer[:0]
+        self.history_start = last_input + 1 - keep
+        return result
+
+    def flush(self):
+        """Push out the samples still inside the filter at the end of a stream"""
+        return self.process(np.zeros(int(np.ceil(self.delay)) + 1, dtype=np.float32))
+
+def resample(audio, in_rate, out_rate, chunk=65536):
+    """Resample a whole buffer chunk by chunk, compensating the filter delay"""
+    if in_rate == out_rate:
+        return np.asarray(audio, dtype=np.float32)
+    resampler = StreamingResampler(in_rate, out_rate)
+    expected = int(len(audio) * out_rate // in_rate)
+    skip = int(round(resampler.delay * out_rate / in_rate))
+
+    out = np.empty(expected, dtype=np.float32)
+    written = 0
+    pieces = (audio[i:i + chunk] for i in range(0, len(audio), chunk))
+    for piece in [*pieces, None]:
+        block = resampler.process(piece) if piece is not None else resampler.flush()
+        drop = min(skip, len(block))
+        skip -= drop
+        block = block[drop:drop + expected - written]
+        out[written:written + len(block)] = block
+        written += len(block)
+    return out[:written]
@@ -0,0 +1,101 @@
+import threading
+import numpy as np
+
+class AudioRingBuffer:
+    """Preallocated float32 sample ring between an audio callback and a consumer
+
+    The producer never blocks: when the consumer falls behind, the incoming
+    block is dropped and counted as an overrun.
+    """
+    
+    def __init__(self, capacity):
+        self.buffer = np.zeros(capacity, dtype=np.float32)
+        self.capacity = capacity
+        self.write_count = 0  # Total samples ever written
+        self.read_count = 0   # Total samples ever read
+        self.condition = threading.Condition()
+        self.closed = False
+        self.stats = {'overruns': 0, 'dropped_samples': 0, 'max_fill': 0}
+    
+    def write(self, samples, block=False):
+        """Append int16 or float32 samples; returns False if they were dropped
+
+        Device callbacks must never block; `block=True` is for file and
+        generator sources that should be throttled instead of dropping. A
+        blocking write is copied in as space frees up, so chunks larger than
+        the ring (or than the reader's wait size allows) still go through.
+        """
+        n = len(samples)
+        with self.condition:
+            if block:
+                done = 0
+                while done < n:
+                    self.condition.wait_for(lambda: self.write_count - self.read_count < self.capacity or self.closed)
+                    free = self.capacity - (self.write_count - self.read_count)
+                    if not free:
+                        break  # Closed while full
+                    count = min(free, n - done)
+                    self._append(samples[done:done + count])
+                    done += count
+                if done == n:
+                    return True
+                self.stats['overruns'] += 1
+                self.stats['dropped_samples'] += n - done
+                return False
+            if n > self.capacity - (self.write_count - self.read_count):
+                self.stats['overruns'] += 1
+                self.stats['dropped_samples'] += n
+                return False
+            self._append(samples)
+        return True
+    
+    def _append(self, samples):
+        """Copy samples that fit into the free slots; caller holds the condition"""
+        n = len(samples)
+        start = self.write_count % self.capacity
+        first = min(n, self.capacity - start)
+        self._store(samples[:first], self.buffer[start:start + first])
+        if first < n:
+            self._store(samples[first:], self.buffer[:n - first])
+        self.write_count += n
+        self.stats['max_fill'] = max(self.stats['max_fill'], self.write_count - self.read_count)
+        self.condition.notify()
+    
+    def _store(self, samples, out):
+        """Copy into ring slots, converting int16 PCM in place"""
+        if samples.dtype == np.int16:
+            np.multiply(samples, np.float32(1 / 32768.0), out=out, casting='unsafe')
+        else:
+            out[:] = samples
+    
+    def write_int16(self, data):
+        """Append raw little-endian int16 PCM bytes"""
+        return self.write(np.frombuffer(data, dtype=np.int16))
+    
+    def read_into(self, out, timeout=None):
+        """Fill `out` with the next samples; returns the count (0 on timeout/close)"""
+        n = len(out)
+        with self.condition:
+            if not self.condition.wait_for(lambda: self.write_count - self.read_count >= n or self.closed, timeout):
+                return 0
+            available = min(n, self.write_count - self.read_count)
+            start = self.read_count % self.capacity
+            first = min(available, self.capacity - start)
+            out[:first] = self.buffer[start:start + first]
+            if first < available:
+                out[first:available] = self.buffer[:available - first]
+            self.read_count += available
+            self.condition.notify_all()
+            return available
+    
+    def close(self):
+        """Release a blocked reader; remaining samples can still be drained"""
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+    
+    def get_stats(self):
+        with self.condition:
+            stats = self.stats.copy()
+            stats['fill'] = self.write_count - self.read_count
+        return stats
@@ -0,0 +1,114 @@
+import threading
+import time
+import wave
+import numpy as np
+
+class AudioSource:
+    """Produces float32 audio into an AudioRingBuffer until stopped"""
+    
+    def __init__(self):
+        self.stats = {'input_overflows': 0, 'callbacks': 0}
+    
+    def start(self, ring):
+        raise NotImplementedError
+    
+    def stop(self):
+        pass
+    
+    def is_active(self):
+        return False
+    
+    def get_stats(self):
+        return self.stats.copy()
+
+class PyAudioCallbackSource(AudioSource):
+    """PortAudio callback stream writing straight into the ring buffer"""
+    
+    def __init__(self, audio, rate, channels, chunk):
+        super().__init__()
+        self.audio = audio
+        self.rate = rate
+        self.channels = channels
+        self.chunk = chunk
+        self.stream = None
+    
+    def start(self, ring):
+        import pyaudio
+        
+        def callback(in_data, frame_count, time_info, status):
+            self.stats['callbacks'] += 1
+            if status & pyaudio.paInputOverflow:
+                self.stats['input_overflows'] += 1
+            ring.write_int16(in_data)
+            return (None, pyaudio.paContinue)
+        
+        self.stream = self.audio.open(
+            format=pyaudio.paInt16,
+            channels=self.channels,
+            rate=self.rate,
+            input=True,
+            frames_per_buffer=self.chunk,
+            stream_callback=callback
+        )
+        self.stream.start_stream()
+    
+    def stop(self):
+        if self.stream is not None:
+            self.stream.stop_stream()
+            self.stream.close()
+            self.stream = None
+    
+    def is_active(self):
+        return self.stream is not None and self.stream.is_active()
+
+class GeneratorAudioSource(AudioSource):
+    """Feed chunks from any iterable (int16 or float32 arrays) for tests and benchmarks"""
+    
+    def __init__(self, chunks, rate, realtime=True):
+        super().__init__()
+        self.chunks = chunks
+        self.rate = rate
+        self.realtime = realtime
+        self.running = False
+        self.thread = None
+    
+    def start(self, ring):
+        self.running = True
+        self.thread = threading.Thread(target=self._feed, args=(ring,), daemon=True)
+        self.thread.start()
+    
+    def _feed(self, ring):
+        next_time = time.perf_counter()
+        for chunk in self.chunks:
+            if not self.running:
+                break
+            chunk = np.asarray(chunk)
+            if chunk.dtype != np.int16:
+                chunk = chunk.astype(np.float32, copy=False)
+            self.stats['callbacks'] += 1
+            # Unpaced sources wait for room rather than overrunning the ring
+            ring.write(chunk, block=not self.realtime)
+            if self.realtime:
+                # Pace delivery like a real device would
+                next_time += len(chunk) / self.rate
+                delay = next_time - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+        self.running = False
+        ring.close()
+    
+    def stop(self):
+        self.running = False
+    
+    def is_active(self):
+        return self.running
+
+class FileAudioSource(GeneratorAudioSource):
+    """Replay a 16-bit mono WAV file as if it came from a microphone"""
+    
+    def __init__(self, path, chunk=1024, realtime=True):
+        with wave.open(str(path), 'rb') as wf:
+            rate = wf.getframerate()
+            samples = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+        chunks = (samples[i:i + chunk] for i in range(0, len(samples), chunk))
+        super().__init__(chunks, rate, realtime)
@@ -0,0 +1,83 @@
+import numpy as np
+
+class CaptureBackend:
+    """Base class for screen capture backends returning RGB NumPy frames"""
+    name = "base"
+    
+    def grab(self):
+        """Return the current screen as an HxWx3 uint8 RGB array"""
+        raise NotImplementedError
+    
+    def close(self):
+        """Release backend resources"""
+        pass
+
+class PyAutoGUIBackend(CaptureBackend):
+    name = "pyautogui"
+    
+    def __init__(self):
+        import pyautogui
+        self.pyautogui = pyautogui
+    
+    def grab(self):
+        return np.asarray(self.pyautogui.screenshot())
+
+class MSSBackend(CaptureBackend):
+    """Capture through mss (XGetImage/XShm on Linux, GDI/BitBlt on Windows)"""
+    name = "mss"
+    
+    def __init__(self, monitor=1):
+        import mss
+        self.mss = mss
+        self.monitor_index = monitor
+        self.sct = None
+    
+    def grab(self):
+        # mss handles are bound to the thread that created them
+        if self.sct is None:
+            self.sct = self.mss.mss()
+        shot = self.sct.grab(self.sct.monitors[self.monitor_index])
+        bgra = np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+        return bgra[:, :, 2::-1]
+    
+    def close(self):
+        if self.sct is not None:
+            self.sct.close()
+            self.sct = None
+
+class SyntheticBackend(CaptureBackend):
+    """Generated frames for tests and benchmarks, no display required"""
+    name = "synthetic"
+    
+    def __init__(self, width=1280, height=720, change_every=1, block_size=64):
+        self.frame = np.full((height, width, 3), 32, dtype=np.uint8)
+        self.change_every = max(1, change_every)
+        self.block_size = block_size
+        self.frame_count = 0
+    
+    def grab(self):
+        # Move a bright block across the screen every `change_every` frames
+        if self.frame_count % self.change_every == 0:
+            height, width = self.frame.shape[:2]
+            step = self.frame_count // self.change_every
+            cols = max(1, width // self.block_size)
+            x = (step % cols) * self.block_size
+            y = ((step // cols) * self.block_size) % max(1, height - self.block_size)
+            self.frame[y:y + self.block_size, x:x + self.block_size] = (step * 37) % 256
+        self.frame_count += 1
+        return self.frame
+
+CAPTURE_BACKENDS = {
+    PyAutoGUIBackend.name: PyAutoGUIBackend,
+    MSSBackend.name: MSSBackend,
+    SyntheticBackend.name: SyntheticBackend
+}
+
+def get_capture_backend(name="pyautogui"):
+    """Create a capture backend by name, falling back to pyautogui"""
+    backend_class = CAPTURE_BACKENDS.get(name, PyAutoGUIBackend)
+    try:
+        return backend_class()
+    except Exception as e:
+        print(f"⚠️ Capture backend '{name}' unavailable ({e}), using pyautogui")
+        return PyAutoGUIBackend()
@@ -0,0 +1,60 @@
+import threading
+from src.config.settings import (
+    CAPTURE_INTERVAL, CAPTURE_MIN_INTERVAL, CAPTURE_MAX_INTERVAL,
+    CAPTURE_BACKOFF_FACTOR, CAPTURE_BURST_EVENTS
+)
+
+class CaptureScheduler:
+    """Pick the delay before the next observation tick from recent activity
+
+    Bursts of input and focus changes drop the interval to the minimum, any
+    input returns it to the base interval, and idle ticks back off
+    exponentially up to the maximum.
+    """
+
+    def __init__(self, base_interval=CAPTURE_INTERVAL, min_interval=CAPTURE_MIN_INTERVAL,
+                 max_interval=CAPTURE_MAX_INTERVAL, backoff_factor=CAPTURE_BACKOFF_FACTOR,
+                 burst_events=CAPTURE_BURST_EVENTS):
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff_factor = backoff_factor
+        self.burst_events = burst_events
+
+        self.interval = base_interval
+        self.focus_changed = False
+        self.wake_event = threading.Event()
+        self.lock = threading.Lock()
+
+    def next_interval(self, event_count):
+        """Update and return the interval given input events since the last tick"""
+        with self.lock:
+            if self.focus_changed or event_count >= self.burst_events:
+                self.interval = self.min_interval
+            elif event_count > 0:
+                self.interval = max(self.min_interval, min(self.interval, self.base_interval))
+            else:
+                self.interval = min(self.max_interval, self.interval * self.backoff_factor)
+            self.focus_changed = False
+            return self.interval
+
+    def notify_activity(self):
+        """Called on input; cuts an idle back-off sleep short"""
+        if self.interval > self.base_interval:
+            self.wake_event.set()
+
+    def notify_focus_change(self, wake=True):
+        """Called when the active window changes; capture right away unless already captured"""
+        with self.lock:
+            self.focus_changed = True
+        if wake:
+            self.wake_event.set()
+
+    def wake(self):
+        """Interrupt the current wait (used on shutdown)"""
+        self.wake_event.set()
+
+    def wait(self, interval=None):
+        """Sleep until the next tick or until woken by activity"""
+        self.wake_event.wait(self.interval if interval is None else interval)
+        self.wake_event.clear()
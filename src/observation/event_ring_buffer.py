@@ -0,0 +1,65 @@
+import threading
+
+class EventRingBuffer:
+    """Fixed-capacity ring of input events with lock-free readers
+
+    Every event gets a sequence number and is stored with it in its slot, so
+    a reader can tell whether a slot still holds the event it expected or was
+    overwritten while it was reading (the per-slot check a seqlock does with
+    version counters). Appending is O(1) and never copies the history.
+
+    Writers take a short lock only because pynput delivers mouse and keyboard
+    events on separate threads; readers never lock.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.slots = [None] * capacity
+        self.next_seq = 0  # Sequence number of the next event; published after the slot is written
+        self.write_lock = threading.Lock()
+
+    def append(self, event):
+        """Store an event and return its sequence number"""
+        with self.write_lock:
+            seq = self.next_seq
+            self.slots[seq % self.capacity] = (seq, event)
+            self.next_seq = seq + 1
+        return seq
+
+    def snapshot(self, count=None):
+        """The most recent `count` events (all retained events by default), oldest first"""
+        end = self.next_seq
+        start = max(0, end - self.capacity)
+        if count is not None:
+            start = max(start, end - count)
+        return self._collect(start, end)[0]
+
+    def events_since(self, cursor, limit=None):
+        """Events with sequence number >= cursor
+
+        Returns (events, next_cursor, dropped) where dropped counts events that
+        were overwritten before they could be read. Pass next_cursor back in to
+        continue where the previous call stopped.
+        """
+        end = self.next_seq
+        if limit is not None:
+            end = min(end, cursor + limit)
+        start = max(cursor, end - self.capacity, 0)
+        events, lost = self._collect(start, end)
+        return events, end, (start - cursor if start > cursor else 0) + lost
+
+    def _collect(self, start, end):
+        events = []
+        lost = 0
+        slots = self.slots
+        capacity = self.capacity
+        for seq in range(start, end):
+            entry = slots[seq % capacity]
+            if entry is None or entry[0] != seq:
+                lost += 1  # Overwritten by a newer event while we were reading
+                continue
+            events.append(entry[1])
+        return events, lost
+
+    def __len__(self):
+        return min(self.next_seq, self.capacity)
@@ -0,0 +1,53 @@
+import threading
+import numpy as np
+
+class FrameRingBuffer:
+    """Fixed-size ring of preallocated frame slots"""
+    
+    def __init__(self, capacity=8):
+        self.capacity = capacity
+        self.frames = None
+        self.timestamps = [None] * capacity
+        self.sequence = 0  # Total frames written
+        self.first_sequence = 0  # First frame of the current allocation
+        self.lock = threading.Lock()
+    
+    def _allocate(self, shape):
+        """Allocate slots for a frame shape (first frame or resolution change)
+
+        Sequence numbers keep counting, so frames from before a resolution
+        change miss instead of resolving to newer frames in the same slots.
+        """
+        self.frames = np.empty((self.capacity,) + shape, dtype=np.uint8)
+        self.timestamps = [None] * self.capacity
+        self.first_sequence = self.sequence
+    
+    def write(self, frame, timestamp):
+        """Copy a frame into the next slot and return its sequence number"""
+        with self.lock:
+            if self.frames is None or self.frames.shape[1:] != frame.shape:
+                self._allocate(frame.shape)
+            slot = self.sequence % self.capacity
+            np.copyto(self.frames[slot], frame)
+            self.timestamps[slot] = timestamp
+            self.sequence += 1
+            return self.sequence - 1
+    
+    def get(self, sequence):
+        """Get (timestamp, frame view) for a sequence number still in the buffer"""
+        with self.lock:
+            if sequence < self.first_sequence or sequence >= self.sequence or sequence < self.sequence - self.capacity:
+                return None
+            slot = sequence % self.capacity
+            return self.timestamps[slot], self.frames[slot]
+    
+    def latest(self):
+        """Get (sequence, timestamp, frame view) of the newest frame"""
+        if self.sequence == 0:
+            return None
+        sequence = self.sequence - 1
+        entry = self.get(sequence)
+        return (sequence,) + entry if entry else None
+    
+    def __len__(self):
+        return min(self.sequence - self.first_sequence, self.capacity)
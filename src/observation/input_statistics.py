@@ -0,0 +1,116 @@
+import threading
+import time
+from bisect import bisect_right
+from src.config.settings import INPUT_STATS_WINDOWS, INPUT_STATS_RESOLUTION_MS, INPUT_PATTERN_WINDOW
+from src.data.models import (
+    EVENT_TYPE_NAMES, EVENT_MOUSE_MOVE, EVENT_MOUSE_CLICK, EVENT_MOUSE_SCROLL, EVENT_KEY_PRESS
+)
+
+# Inter-event time histogram bin edges in milliseconds (last bin is open-ended)
+INTERVAL_EDGES_MS = (20, 50, 100, 200, 500, 1000, 2000)
+
+class InputStatistics:
+    """Sliding-window input counts, rates and inter-event-time histograms
+
+    Time is cut into buckets of INPUT_STATS_RESOLUTION_MS held in a ring as
+    long as the largest window. Each window keeps running totals: an event
+    adds to its bucket and to every window, and when time moves on the
+    buckets that fall out of a window are subtracted from it. Recording and
+    reading are O(1) per event and per elapsed bucket, however busy the input.
+    """
+
+    def __init__(self, windows=INPUT_STATS_WINDOWS, resolution_ms=INPUT_STATS_RESOLUTION_MS):
+        self.windows = tuple(windows)
+        self.resolution_ns = int(resolution_ms * 1_000_000)
+        self.window_buckets = [max(1, int(seconds * 1000 // resolution_ms)) for seconds in self.windows]
+        self.size = max(self.window_buckets)
+
+        # Columns: one count per event type, then the interval histogram. Plain
+        # lists: per-event updates touch single cells, where NumPy is slower
+        self.types = len(EVENT_TYPE_NAMES)
+        self.edges_ns = [edge * 1_000_000 for edge in INTERVAL_EDGES_MS]
+        self.width = self.types + len(INTERVAL_EDGES_MS) + 1
+        self.buckets = [[0] * self.width for _ in range(self.size)]
+        self.sums = [[0] * self.width for _ in self.windows]
+
+        self.head = None  # Absolute index of the newest bucket
+        self.last_event_ns = None
+        self.lock = threading.Lock()
+
+    def record(self, type_code, time_ns=None):
+        """Count one event (called from the input listener threads)"""
+        if time_ns is None:
+            time_ns = time.monotonic_ns()
+        bucket = time_ns // self.resolution_ns
+        with self.lock:
+            self._advance(bucket if self.head is None else max(bucket, self.head))
+            age = self.head - bucket
+            if age >= self.size:
+                return
+            row = self.buckets[bucket % self.size]
+            row[type_code] += 1
+            column = None
+            if self.last_event_ns is not None:
+                column = self.types + bisect_right(self.edges_ns, max(0, time_ns - self.last_event_ns))
+                row[column] += 1
+            for sums, length in zip(self.sums, self.window_buckets):
+                if age < length:  # Window still covers this bucket
+                    sums[type_code] += 1
+                    if column is not None:
+                        sums[column] += 1
+            self.last_event_ns = max(time_ns, self.last_event_ns or 0)
+
+    def _advance(self, bucket):
+        """Move the head to `bucket`, expiring what falls out of each window"""
+        if self.head is None or bucket - self.head >= self.size:
+            for row in self.buckets + self.sums:
+                row[:] = [0] * self.width
+            self.head = bucket
+            return
+        for current in range(self.head + 1, bucket + 1):
+            for sums, length in zip(self.sums, self.window_buckets):
+                expired = self.buckets[(current - length) % self.size]
+                if any(expired):
+                    sums[:] = [total - count for total, count in zip(sums, expired)]
+            self.buckets[current % self.size][:] = [0] * self.width
+        self.head = max(self.head, bucket)
+
+    def window_stats(self, seconds):
+        """Counts, rates and interval histogram over one of the configured windows"""
+        index = self.windows.index(seconds)
+        with self.lock:
+            self._advance(time.monotonic_ns() // self.resolution_ns)
+            totals = list(self.sums[index])
+        counts = {name: int(totals[code]) for code, name in enumerate(EVENT_TYPE_NAMES)}
+        total = sum(counts.values())
+        return {
+            'window': seconds,
+            'counts': counts,
+            'total': total,
+            'rate': total / seconds,
+            'rates': {name: count / seconds for name, count in counts.items()},
+            'interval_histogram': totals[self.types:],
+            'interval_edges_ms': INTERVAL_EDGES_MS
+        }
+
+    def snapshot(self):
+        """Stats for every window"""
+        return {seconds: self.window_stats(seconds) for seconds in self.windows}
+
+    def classify(self, seconds=INPUT_PATTERN_WINDOW):
+        """Dominant input pattern over a window (same shares as the old last-20-events rules)"""
+        stats = self.window_stats(seconds)
+        total = stats['total']
+        if total == 0:
+            return "no_input"
+        counts = stats['counts']
+        if counts[EVENT_TYPE_NAMES[EVENT_KEY_PRESS]] > total * 0.5:
+            return "typing"
+        elif counts[EVENT_TYPE_NAMES[EVENT_MOUSE_CLICK]] > total * 0.25:
+            return "clicking"
+        elif counts[EVENT_TYPE_NAMES[EVENT_MOUSE_MOVE]] > total * 0.75:
+            return "navigating"
+        elif counts[EVENT_TYPE_NAMES[EVENT_MOUSE_SCROLL]] > total * 0.15:
+            return "scrolling"
+        else:
+            return "mixed_input"
@@ -1,18 +1,44 @@
 from pynput import mouse, keyboard
-from datetime import datetime
 import json
+import math
+import sys
 import threading
-from src.data.models import InputEvent
+import time
+from src.config.settings import (
+    OBSERVATIONS_DIR, MOUSE_MOVE_COALESCE, MOUSE_MOVE_COALESCE_MS, MOUSE_MOVE_COALESCE_PX, INPUT_LOG_ENABLED
+)
+from src.data.models import (
+    InputRecord, EVENT_MOUSE_MOVE, EVENT_MOUSE_CLICK, EVENT_MOUSE_SCROLL, EVENT_KEY_PRESS
+)
+from src.observation.event_ring_buffer import EventRingBuffer
+from src.observation.input_statistics import InputStatistics
+from src.data.input_event_log import InputEventLog
 
 class InputTracker:
     def __init__(self):
-        self.events = []
         self.max_events = 1000
+        self.events = EventRingBuffer(self.max_events)
+        self.stats = InputStatistics()  # Sliding 1 s/10 s/60 s counts over every event
+        self.log = None
         self.is_tracking = False
+        self.activity_listeners = []
+        
+        # Raw pointer motion is folded into one event per run of moves:
+        # [start_ns, start_x, start_y, last_ns, last_x, last_y, path_length, samples]
+        self.move_run = None
+        self.coalesce_ns = MOUSE_MOVE_COALESCE_MS * 1_000_000
+        # Mouse and keyboard events arrive on different listener threads; events
+        # are stamped and stored under one lock so the ring and log stay in time order
+        self.event_lock = threading.Lock()
         
     def start_tracking(self):
         """Start tracking mouse and keyboard events"""
         self.is_tracking = True
+        if INPUT_LOG_ENABLED and self.log is None:
+            try:
+                self.log = InputEventLog(OBSERVATIONS_DIR / "input")
+            except Exception as e:
+                print(f"⚠️ Input event log unavailable: {e}")
         
         # Start mouse listener
         self.mouse_listener = mouse.Listener(
@@ -33,6 +59,10 @@ class InputTracker:
     def stop_tracking(self):
         """Stop tracking events"""
         self.is_tracking = False
+        self.flush_moves()
+        if self.log is not None:
+            self.log.close()
+            self.log = None
         if hasattr(self, 'mouse_listener'):
             self.mouse_listener.stop()
         if hasattr(self, 'keyboard_listener'):
@@ -40,30 +70,60 @@ class InputTracker:
             
     def on_mouse_move(self, x, y):
         if self.is_tracking:
-            event = InputEvent(
-                timestamp=datetime.now().isoformat(),
-                event_type="mouse_move",
-                details={"x": x, "y": y}
-            )
-            self._add_event(event)
+            with self.event_lock:
+                if not MOUSE_MOVE_COALESCE:
+                    self._add_event(InputRecord(EVENT_MOUSE_MOVE, time.monotonic_ns(), x, y))
+                else:
+                    self._coalesce_move(x, y, time.monotonic_ns())
+            self._notify_listeners()
+    
+    def _coalesce_move(self, x, y, now):
+        """Extend the current run of moves, emitting it once it spans too long or too far (lock held)"""
+        run = self.move_run
+        if run is not None:
+            if now - run[0] <= self.coalesce_ns and \
+                    abs(x - run[1]) + abs(y - run[2]) <= MOUSE_MOVE_COALESCE_PX:
+                run[6] += math.hypot(x - run[4], y - run[5])
+                run[3], run[4], run[5] = now, x, y
+                run[7] += 1
+                return
+            self._add_event(self._move_event(run))
+        self.move_run = [now, x, y, now, x, y, 0.0, 1]
+    
+    def flush_moves(self):
+        """Emit the run of moves in progress (on reads and on stop)"""
+        with self.event_lock:
+            self._flush_moves_locked()
+    
+    def _flush_moves_locked(self):
+        run = self.move_run
+        self.move_run = None
+        if run is not None:
+            self._add_event(self._move_event(run))
+    
+    def _move_event(self, run):
+        start_ns, start_x, start_y, last_ns, last_x, last_y, path_length, samples = run
+        return InputRecord(
+            EVENT_MOUSE_MOVE, start_ns, last_x, last_y,
+            dx=last_x - start_x, dy=last_y - start_y,
+            path_length=path_length, duration_ns=last_ns - start_ns, samples=samples
+        )
     
     def on_mouse_click(self, x, y, button, pressed):
         if self.is_tracking:
-            event = InputEvent(
-                timestamp=datetime.now().isoformat(),
-                event_type="mouse_click",
-                details={"x": x, "y": y, "button": str(button), "pressed": pressed}
-            )
-            self._add_event(event)
+            with self.event_lock:
+                self._flush_moves_locked()
+                self._add_event(InputRecord(
+                    EVENT_MOUSE_CLICK, time.monotonic_ns(), x, y, code=sys.intern(str(button)), pressed=pressed
+                ))
+            self._notify_listeners()
     
     def on_mouse_scroll(self, x, y, dx, dy):
         if self.is_tracking:
-            event = InputEvent(
-                timestamp=datetime.now().isoformat(),
-                event_type="mouse_scroll",
-                details={"x": x, "y": y, "dx": dx, "dy": dy}
-            )
-            self._add_event(event)
+            with self.event_lock:
+                self._flush_moves_locked()
+                self._add_event(InputRecord(EVENT_MOUSE_SCROLL, time.monotonic_ns(), x, y, dx=dx, dy=dy))
+            self._notify_listeners()
     
     def on_key_press(self, key):
         if self.is_tracking:
@@ -72,22 +132,49 @@ class InputTracker:
             except AttributeError:
                 key_char = str(key)
                 
-            event = InputEvent(
-                timestamp=datetime.now().isoformat(),
-                event_type="key_press",
-                details={"key": key_char}
-            )
-            self._add_event(event)
+            if key_char is not None:
+                key_char = sys.intern(key_char)
+            with self.event_lock:
+                self._flush_moves_locked()
+                self._add_event(InputRecord(EVENT_KEY_PRESS, time.monotonic_ns(), code=key_char))
+            self._notify_listeners()
     
     def on_key_release(self, key):
         pass  # We mainly care about key presses
     
     def _add_event(self, event):
-        """Add event to history with size limit"""
+        """Add event to history (event_lock held); the ring overwrites the oldest once full"""
         self.events.append(event)
-        if len(self.events) > self.max_events:
-            self.events = self.events[-self.max_events:]
+        self.stats.record(event.type_code, event.time_ns)
+        log = self.log
+        if log is not None:
+            log.append(event)
+    
+    def _notify_listeners(self):
+        for listener in self.activity_listeners:
+            listener()
+    
+    @property
+    def event_count(self):
+        """Total events seen, used to measure activity between ticks"""
+        return self.events.next_seq
+    
+    def add_activity_listener(self, listener):
+        """Register a callable invoked on every input event"""
+        self.activity_listeners.append(listener)
     
     def get_recent_events(self, count=10):
         """Get most recent events"""
-        return self.events[-count:] if self.events else []
\ No newline at end of file
+        self._flush_idle_moves()
+        return self.events.snapshot(count)
+    
+    def get_events_since(self, cursor, limit=None):
+        """Get (events, next_cursor, dropped) for events from sequence number `cursor` on"""
+        self._flush_idle_moves()
+        return self.events.events_since(cursor, limit)
+    
+    def _flush_idle_moves(self):
+        """A run whose window has passed is complete even if the pointer stopped"""
+        run = self.move_run
+        if run is not None and time.monotonic_ns() - run[0] > self.coalesce_ns:
+            self.flush_moves()
\ No newline at end of file
@@ -3,56 +3,197 @@ import cv2
 import numpy as np
 from datetime import datetime
 import os
-from src.config.settings import OBSERVATIONS_DIR, SCREEN_CAPTURE_QUALITY
+import threading
+from concurrent.futures import Future
+from PIL import Image
+from src.config.settings import (
+    OBSERVATIONS_DIR, SCREEN_CHANGE_THRESHOLD, SCREEN_DIFF_SIZE,
+    SCREEN_CAPTURE_BACKEND, SCREEN_BUFFER_SIZE, SCREEN_PERSIST_FRAMES, SCREEN_STORAGE_MODE,
+    SCREEN_ENCODER_WORKERS, SCREEN_ENCODER_QUEUE, SCREEN_ENCODER_POLICY, WINDOW_EVENTS_ENABLED
+)
+from src.observation.capture_backends import get_capture_backend
+from src.observation.frame_buffer import FrameRingBuffer
+from src.observation.window_state import WindowStateService
+from src.data.screenshot_store import JpegScreenshotStore
+from src.data.tile_store import TileDeltaStore
+from src.data.segment_archive import SegmentArchive
+from src.data.encoder_pool import EncoderPool
 
 class ScreenCapture:
-    def __init__(self):
+    def __init__(self, backend=None, store=None, window_state=None):
         self.screenshot_dir = OBSERVATIONS_DIR / "screenshots"
         self.screenshot_dir.mkdir(exist_ok=True)
         
+        # Frames land in a preallocated ring buffer; disk persistence is optional
+        self.backend = backend or get_capture_backend(SCREEN_CAPTURE_BACKEND)
+        self.frame_buffer = FrameRingBuffer(SCREEN_BUFFER_SIZE)
+        if store is None and SCREEN_PERSIST_FRAMES:
+            store = self._create_store(SCREEN_STORAGE_MODE)
+            if SCREEN_ENCODER_WORKERS > 0:
+                store = EncoderPool(store, SCREEN_ENCODER_WORKERS, SCREEN_ENCODER_QUEUE, SCREEN_ENCODER_POLICY)
+        self.store = store
+        
+        # Active window is queried once per tick (or pushed by X11 events)
+        self.window_state = window_state or WindowStateService(WINDOW_EVENTS_ENABLED)
+        
+        # Change detection state
+        self.last_signature = None
+        self.last_stored = None  # Path, or Future of the path, of the frame last_signature came from
+        self.last_screenshot_path = None
+        self.last_saved_timestamp = None
+        self.pending_screenshot = None
+        self.path_lock = threading.Lock()
+        self.stats = {
+            'frames_captured': 0,
+            'frames_written': 0,
+            'frames_skipped': 0,
+            'bytes_written': 0
+        }
+        
     def capture_screenshot(self):
-        """Capture screen and save with metadata"""
+        """Capture screen and save with metadata
+
+        'screenshot_path' is the stored copy of this frame: for an unchanged
+        frame, the stored frame it matches. While that copy is still being
+        encoded in the background it is None, and 'pending_screenshot' is a
+        Future that resolves to the path (None if the frame was dropped). The frame itself
+        lives in a reused ring-buffer slot; copy it if it must outlive the tick.
+        """
         try:
-            # Capture screenshot
-            screenshot = pyautogui.screenshot()
+            # Capture screenshot into the ring buffer
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-            filename = f"screenshot_{timestamp}.jpg"
-            filepath = self.screenshot_dir / filename
+            frame_seq = self.frame_buffer.write(self.backend.grab(), timestamp)
+            frame = self.frame_buffer.get(frame_seq)[1]
+            self.stats['frames_captured'] += 1
             
-            # Save compressed image
-            screenshot.save(filepath, "JPEG", quality=int(SCREEN_CAPTURE_QUALITY * 100))
+            # Only encode and write frames that differ from the last stored one
+            signature = self._frame_signature(frame)
+            frame_changed = self._has_changed(signature)
+            
+            screenshot_path = None
+            pending = None
+            if frame_changed:
+                # Compared against from now on; undone if the frame is never written
+                self.last_signature = signature
+                self.last_stored = None
+                if self.store is not None:
+                    saved = self.store.save(frame, timestamp)
+                    self.last_stored = saved
+                    if isinstance(saved, Future):
+                        # Encoding happens in the background; the path arrives later
+                        self.pending_screenshot = pending = saved
+                        saved.add_done_callback(
+                            lambda future, ts=timestamp, sig=signature: self._record_saved_path(future.result(), ts, sig)
+                        )
+                    else:
+                        self._record_saved_path(saved, timestamp, signature)
+                        screenshot_path = saved
+            else:
+                self.stats['frames_skipped'] += 1
+                # The frame this one matches, which may still be encoding
+                stored = self.last_stored
+                if isinstance(stored, Future):
+                    if stored.done():
+                        screenshot_path = stored.result()
+                    else:
+                        pending = stored
+                else:
+                    screenshot_path = stored
             
             # Get mouse position and active window
             mouse_x, mouse_y = pyautogui.position()
-            active_window = self._get_active_window()
+            window = self.window_state.refresh()
             
             return {
                 'timestamp': timestamp,
-                'screenshot_path': str(filepath),
+                'screenshot_path': screenshot_path,
+                'pending_screenshot': pending,
+                'frame_seq': frame_seq,
+                'frame_changed': frame_changed,
                 'mouse_x': mouse_x,
                 'mouse_y': mouse_y,
-                'active_window': active_window,
-                'window_title': self._get_window_title()
+                'active_window': window['active_window'],
+                'window_title': window['window_title'],
+                'window_class': window['window_class'],
+                'focus_changed': window['focus_changed']
             }
             
         except Exception as e:
             print(f"Screen capture error: {e}")
             return None
     
-    def _get_active_window(self):
-        """Get current active window name"""
-        try:
-            import pygetwindow as gw
-            window = gw.getActiveWindow()
-            return window.title if window else "Unknown"
-        except:
-            return "Unknown"
-    
-    def _get_window_title(self):
-        """Get window title"""
-        try:
-            import pygetwindow as gw
-            window = gw.getActiveWindow()
-            return window.title if window else "Unknown"
-        except:
-            return "Unknown"
\ No newline at end of file
+    def _record_saved_path(self, path, timestamp, signature):
+        """Track the newest written frame (encoders may finish out of order)"""
+        if not path:
+            # Dropped by the encoder pool or failed: the next similar frame must
+            # be stored rather than counted as unchanged against nothing on disk
+            with self.path_lock:
+                if self.last_signature is signature:
+                    self.last_signature = None
+            return
+        with self.path_lock:
+            self.stats['frames_written'] += 1
+            # Archive references ("file#offset") aren't files; such stores count their own bytes
+            if os.path.exists(path):
+                self.stats['bytes_written'] += os.path.getsize(path)
+            if self.last_saved_timestamp is None or timestamp > self.last_saved_timestamp:
+                self.last_saved_timestamp = timestamp
+                self.last_screenshot_path = path
+    
+    def _frame_signature(self, frame):
+        """Downsampled grayscale copy of a frame used for change detection"""
+        gray = cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY)
+        return cv2.resize(gray, SCREEN_DIFF_SIZE, interpolation=cv2.INTER_AREA).astype(np.int16)
+    
+    def _create_store(self, mode):
+        """Create the frame persistence store for a storage mode"""
+        if mode == "tiles":
+            return TileDeltaStore(self.screenshot_dir)
+        if mode == "segments":
+            return SegmentArchive(self.screenshot_dir / "segments")
+        return JpegScreenshotStore(self.screenshot_dir)
+    
+    def read_frame(self, screenshot_path):
+        """Rebuild a stored frame from its screenshot_path"""
+        store = self.store.store if isinstance(self.store, EncoderPool) else self.store
+        if hasattr(store, 'read_frame'):
+            return store.read_frame(screenshot_path)
+        return np.asarray(Image.open(screenshot_path).convert('RGB'))
+    
+    def get_latest_frame(self):
+        """Get (sequence, timestamp, frame) of the newest captured frame"""
+        return self.frame_buffer.latest()
+    
+    def _has_changed(self, signature):
+        """Compare a frame signature against the last stored frame"""
+        if self.last_signature is None or self.last_signature.shape != signature.shape:
+            return True
+        # Max rather than mean so small localized changes are not averaged away
+        difference = np.abs(signature - self.last_signature).max()
+        return bool(difference >= SCREEN_CHANGE_THRESHOLD)
+    
+    def get_capture_stats(self):
+        """Get change detection counters"""
+        stats = self.stats.copy()
+        captured = stats['frames_captured']
+        stats['skip_ratio'] = stats['frames_skipped'] / captured if captured else 0.0
+        store = self.store
+        if isinstance(store, EncoderPool):
+            stats['encoder'] = store.get_stats()
+            store = store.store
+        if hasattr(store, 'get_stats'):
+            stats['store'] = store.get_stats()
+            if 'bytes_written' in stats['store']:
+                stats['bytes_written'] = stats['store']['bytes_written']
+        return stats
+    
+    def close(self):
+        """Flush pending frame writes and release the capture backend"""
+        store = self.store
+        if isinstance(store, EncoderPool):
+            store.shutdown()
+            store = store.store
+        if hasattr(store, 'close'):
+            store.close()
+        self.backend.close()
+        self.window_state.stop()
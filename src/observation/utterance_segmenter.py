@@ -0,0 +1,101 @@
+from collections import deque
+import numpy as np
+from src.config.settings import (
+    AUDIO_RATE, AUDIO_ENDPOINT_SILENCE_MS, AUDIO_MAX_SEGMENT_SECONDS,
+    AUDIO_PREROLL_MS, AUDIO_SEGMENT_OVERLAP_MS, VAD_MIN_SPEECH_MS
+)
+from src.processing.voice_activity import VoiceActivityDetector
+
+class UtteranceSegmenter:
+    """Cut a stream of audio chunks into utterances as soon as the speaker pauses
+
+    Audio before speech onset is kept as pre-roll, an utterance ends after
+    AUDIO_ENDPOINT_SILENCE_MS of silence, and utterances longer than
+    AUDIO_MAX_SEGMENT_SECONDS are split with an overlap so a word on the
+    boundary appears in both pieces.
+    """
+
+    def __init__(self, sample_rate=AUDIO_RATE, vad=None):
+        self.sample_rate = sample_rate
+        self.vad = vad or VoiceActivityDetector(sample_rate)
+        self.buffer = np.empty(int(AUDIO_MAX_SEGMENT_SECONDS * sample_rate), dtype=np.float32)
+        self.position = 0
+        self.preroll = deque()
+        self.preroll_samples = 0
+        self.max_preroll = int(AUDIO_PREROLL_MS * sample_rate / 1000)
+        self.overlap = int(AUDIO_SEGMENT_OVERLAP_MS * sample_rate / 1000)
+        self.endpoint_samples = int(AUDIO_ENDPOINT_SILENCE_MS * sample_rate / 1000)
+        self.min_speech_samples = int(VAD_MIN_SPEECH_MS * sample_rate / 1000)
+
+        self.in_speech = False
+        self.speech_samples = 0
+        self.silence_samples = 0
+
+    def push(self, chunk):
+        """Feed one chunk of float32 samples; return the utterances it completed"""
+        is_speech = bool(self.vad.speech_mask(chunk).any())
+        completed = []
+
+        if not self.in_speech:
+            if is_speech:
+                self._start_utterance()
+            else:
+                self._keep_preroll(chunk)
+                return completed
+
+        # Split overlong utterances, carrying the tail into the next piece
+        if self.position + len(chunk) > len(self.buffer):
+            completed.extend(self._emit())
+            carry = min(self.overlap, len(self.buffer) - len(chunk))
+            tail = self.last_emitted[-carry:] if carry > 0 else self.last_emitted[:0]
+            self.buffer[:len(tail)] = tail
+            self.position = len(tail)
+            self.in_speech = True
+
+        self.buffer[self.position:self.position + len(chunk)] = chunk
+        self.position += len(chunk)
+
+        if is_speech:
+            self.speech_samples += len(chunk)
+            self.silence_samples = 0
+        else:
+            self.silence_samples += len(chunk)
+            if self.silence_samples >= self.endpoint_samples:
+                completed.extend(self._emit())
+                self.in_speech = False
+        return completed
+
+    def flush(self):
+        """Emit whatever utterance is in progress (used on shutdown)"""
+        if self.in_speech:
+            self.in_speech = False
+            return self._emit()
+        return []
+
+    def _start_utterance(self):
+        self.in_speech = True
+        self.position = 0
+        self.speech_samples = 0
+        self.silence_samples = 0
+        while self.preroll:
+            previous = self.preroll.popleft()
+            self.buffer[self.position:self.position + len(previous)] = previous
+            self.position += len(previous)
+        self.preroll_samples = 0
+
+    def _keep_preroll(self, chunk):
+        self.preroll.append(chunk.copy())
+        self.preroll_samples += len(chunk)
+        while self.preroll and self.preroll_samples - len(self.preroll[0]) >= self.max_preroll:
+            self.preroll_samples -= len(self.preroll.popleft())
+
+    def _emit(self):
+        """Copy the buffered utterance out, dropping it if it was only a click"""
+        self.last_emitted = self.buffer[:self.position].copy()
+        speech_samples = self.speech_samples
+        self.position = 0
+        self.speech_samples = 0
+        self.silence_samples = 0
+        if speech_samples < self.min_speech_samples:
+            return []
+        return [self.last_emitted]
@@ -0,0 +1,178 @@
+import os
+import select
+import threading
+
+# active_window is the window title everywhere; window_class is the X11
+# WM_CLASS application name ("code", "firefox") when it is known
+UNKNOWN_WINDOW = {'active_window': "Unknown", 'window_title': "Unknown", 'window_class': None}
+
+class WindowStateService:
+    """Single source of the active window, queried at most once per tick
+
+    On X11 a watcher thread subscribes to _NET_ACTIVE_WINDOW and window name
+    changes, so the cached state is pushed rather than polled. Elsewhere (or
+    without python-xlib) refresh() falls back to one pygetwindow query.
+    """
+
+    def __init__(self, use_events=True):
+        self.state = dict(UNKNOWN_WINDOW)
+        self.lock = threading.Lock()
+        self.listeners = []
+        self.watcher = None
+        self.changed_since_refresh = False
+
+        if use_events and os.environ.get('DISPLAY'):
+            try:
+                self.watcher = X11WindowWatcher(self._on_window_event)
+            except Exception as e:
+                print(f"⚠️ X11 window events unavailable ({e}), polling instead")
+                self.watcher = None
+
+    def start(self):
+        """Start pushing focus changes (no-op when polling)"""
+        if self.watcher:
+            self.watcher.start()
+
+    def stop(self):
+        if self.watcher:
+            self.watcher.stop()
+
+    def add_listener(self, listener):
+        """Register a callable invoked when the active window changes"""
+        self.listeners.append(listener)
+
+    def refresh(self):
+        """Get the window state for this tick, with a focus_changed flag"""
+        if self.watcher and self.watcher.is_alive():
+            with self.lock:
+                state = dict(self.state)
+                state['focus_changed'] = self.changed_since_refresh
+                self.changed_since_refresh = False
+            return state
+
+        state = self._query_pygetwindow()
+        with self.lock:
+            changed = state['active_window'] != self.state['active_window']
+            self.state = state
+        return dict(state, focus_changed=changed)
+
+    def get(self):
+        """Get the cached window state without querying"""
+        with self.lock:
+            return dict(self.state)
+
+    def _query_pygetwindow(self):
+        try:
+            import pygetwindow as gw
+            window = gw.getActiveWindow()
+            title = window.title if window else "Unknown"
+            return {'active_window': title, 'window_title': title, 'window_class': None}
+        except:
+            return dict(UNKNOWN_WINDOW)
+
+    def _on_window_event(self, state, focus_changed):
+        with self.lock:
+            self.state = state
+            if focus_changed:
+                self.changed_since_refresh = True
+        if focus_changed:
+            for listener in self.listeners:
+                listener()
+
+class X11WindowWatcher(threading.Thread):
+    """Watch root and active-window property changes through python-xlib"""
+
+    def __init__(self, callback):
+        super().__init__(name="x11-window-watcher", daemon=True)
+        from Xlib import X, display
+        self.X = X
+        self.display = display.Display()
+        # Windows can vanish between events; ignore async BadWindow errors
+        self.display.set_error_handler(lambda *args: None)
+        self.root = self.display.screen().root
+        self.callback = callback
+        self.running = False
+        self.active_window = None
+        self.active_window_id = None
+        self.focus_known = False
+
+        self.NET_ACTIVE_WINDOW = self.display.intern_atom('_NET_ACTIVE_WINDOW')
+        self.NET_WM_NAME = self.display.intern_atom('_NET_WM_NAME')
+        self.WM_NAME = self.display.intern_atom('WM_NAME')
+        self.UTF8_STRING = self.display.intern_atom('UTF8_STRING')
+
+        self.root.change_attributes(event_mask=X.PropertyChangeMask)
+
+    def run(self):
+        self.running = True
+        self._update_active_window()
+        fileno = self.display.fileno()
+        while self.running:
+            # Wake up periodically so stop() does not need to touch the display
+            if not self.display.pending_events():
+                readable, _, _ = select.select([fileno], [], [], 0.5)
+                if not readable:
+                    continue
+            try:
+                event = self.display.next_event()
+            except Exception as e:
+                print(f"X11 window watcher error: {e}")
+                break
+            if event.type != self.X.PropertyNotify:
+                continue
+            if event.window == self.root and event.atom == self.NET_ACTIVE_WINDOW:
+                self._update_active_window()
+            elif self.active_window is not None and event.window == self.active_window \
+                    and event.atom in (self.NET_WM_NAME, self.WM_NAME):
+                self.callback(self._read_state(self.active_window), False)
+        self.display.close()
+
+    def stop(self):
+        self.running = False
+
+    def _update_active_window(self):
+        """Follow a focus change and subscribe to the new window's title only"""
+        window_id = None
+        try:
+            prop = self.root.get_full_property(self.NET_ACTIVE_WINDOW, self.X.AnyPropertyType)
+            if prop and prop.value and prop.value[0]:
+                window_id = prop.value[0]
+        except Exception:
+            window_id = None
+
+        if self.focus_known and window_id == self.active_window_id:
+            # _NET_ACTIVE_WINDOW was rewritten with the same window
+            return
+        self.focus_known = True
+        self.active_window_id = window_id
+        if self.active_window is not None:
+            # Stop title events from the window that lost focus
+            try:
+                self.active_window.change_attributes(event_mask=self.X.NoEventMask)
+            except Exception:
+                pass  # Already destroyed
+
+        window = None
+        if window_id is not None:
+            try:
+                window = self.display.create_resource_object('window', window_id)
+                window.change_attributes(event_mask=self.X.PropertyChangeMask)
+            except Exception:
+                window = None
+        self.active_window = window
+        self.callback(self._read_state(window), True)
+
+    def _read_state(self, window):
+        if window is None:
+            return dict(UNKNOWN_WINDOW)
+        try:
+            name = window.get_full_property(self.NET_WM_NAME, self.UTF8_STRING)
+            title = name.value if name else window.get_wm_name()
+            if isinstance(title, bytes):
+                title = title.decode('utf-8', 'replace')
+            wm_class = window.get_wm_class()
+            title = title or "Unknown"
+            return {'active_window': title, 'window_title': title,
+                    'window_class': wm_class[1] if wm_class else None}
+        except Exception:
+            return dict(UNKNOWN_WINDOW)
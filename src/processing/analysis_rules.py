@@ -0,0 +1,289 @@
+import json
+import time
+from pathlib import Path
+from src.config.settings import ANALYSIS_RULES_FILE, ANALYSIS_RULES_RELOAD_INTERVAL
+
+# Built-in tables; a rules file can override any entry of any section
+DEFAULT_RULES = {
+    # Checked in order: the first application with a keyword anywhere in the window text wins
+    'app_patterns': {
+        'excel': ['excel', 'xlsx', 'xls'],
+        'word': ['word', 'docx', 'doc'],
+        'chrome': ['chrome', 'google'],
+        'firefox': ['firefox', 'mozilla'],
+        'explorer': ['explorer', 'file', 'folder'],
+        'vscode': ['code', 'visual studio'],
+        'notepad': ['notepad', 'txt'],
+        'powerpoint': ['powerpoint', 'ppt'],
+        'outlook': ['outlook', 'email']
+    },
+    'application_profiles': {
+        'excel': {
+            'tasks': {
+                'data_entry': ['typing', 'navigating'],
+                'formula_work': ['typing', 'mixed_input'],
+                'formatting': ['clicking', 'mixed_input'],
+                'chart_creation': ['clicking', 'navigating']
+            },
+            'confidence_base': 0.8
+        },
+        'word': {
+            'tasks': {
+                'document_writing': ['typing', 'mixed_input'],
+                'editing': ['typing', 'clicking'],
+                'formatting': ['clicking', 'mixed_input'],
+                'reviewing': ['scrolling', 'mixed_input']
+            },
+            'confidence_base': 0.7
+        },
+        'chrome': {
+            'tasks': {
+                'web_browsing': ['navigating', 'scrolling'],
+                'form_filling': ['typing', 'clicking'],
+                'research': ['typing', 'mixed_input'],
+                'shopping': ['clicking', 'scrolling']
+            },
+            'confidence_base': 0.6
+        },
+        'explorer': {
+            'tasks': {
+                'file_organization': ['clicking', 'navigating'],
+                'file_search': ['typing', 'mixed_input'],
+                'copy_move_operations': ['clicking', 'mixed_input']
+            },
+            'confidence_base': 0.75
+        },
+        'vscode': {
+            'tasks': {
+                'coding': ['typing', 'mixed_input'],
+                'debugging': ['clicking', 'mixed_input'],
+                'file_navigation': ['navigating', 'clicking']
+            },
+            'confidence_base': 0.8
+        }
+    },
+    'default_profile': {
+        'tasks': {'general_usage': ['mixed_input']},
+        'confidence_base': 0.5
+    },
+    'title_patterns': {
+        'excel': {
+            'budget': {'task': 'budget_management', 'confidence_boost': 0.1},
+            'report': {'task': 'report_generation', 'confidence_boost': 0.1},
+            'sales': {'task': 'sales_analysis', 'confidence_boost': 0.1},
+            'invoice': {'task': 'invoice_processing', 'confidence_boost': 0.15}
+        },
+        'word': {
+            'report': {'task': 'report_writing', 'confidence_boost': 0.1},
+            'resume': {'task': 'resume_creation', 'confidence_boost': 0.1},
+            'letter': {'task': 'letter_writing', 'confidence_boost': 0.1},
+            'proposal': {'task': 'proposal_creation', 'confidence_boost': 0.15}
+        },
+        'chrome': {
+            'google': {'task': 'searching', 'confidence_boost': 0.1},
+            'youtube': {'task': 'video_watching', 'confidence_boost': 0.05},
+            'mail': {'task': 'email_management', 'confidence_boost': 0.1},
+            'shopping': {'task': 'online_shopping', 'confidence_boost': 0.1}
+        }
+    },
+    'task_steps': {
+        'excel_data_entry': ["Open Excel", "Select cells", "Enter data", "Save file"],
+        'excel_formula_work': ["Open Excel", "Select cells", "Enter formulas", "Calculate results", "Save file"],
+        'word_document_writing': ["Open Word", "Type content", "Format text", "Save document"],
+        'chrome_web_browsing': ["Open browser", "Navigate to website", "Scroll content", "Click links"],
+        'explorer_file_organization': ["Open File Explorer", "Select files", "Move/copy files", "Create folders"]
+    },
+    'automation_potential': {
+        'High': [
+            'excel_data_entry', 'excel_formula_work', 'excel_report_generation',
+            'word_document_writing', 'explorer_file_organization'
+        ],
+        'Medium': [
+            'chrome_form_filling', 'chrome_research', 'word_editing'
+        ]
+    },
+    # Checked in order: the first command word in the transcript wins
+    'audio_commands': {
+        'open': {'task_modifier': 'opening', 'confidence_boost': 0.2},
+        'save': {'task_modifier': 'saving', 'confidence_boost': 0.25},
+        'create': {'task_modifier': 'creating', 'confidence_boost': 0.2},
+        'search': {'task_modifier': 'searching', 'confidence_boost': 0.15},
+        'send': {'task_modifier': 'sending', 'confidence_boost': 0.2}
+    }
+}
+
+def compile_keywords(tables):
+    """Flatten ordered {name: keywords} tables into one ordered tuple of (keyword, name)
+
+    Scanning the tuple with `in` gives exactly the first-table-wins result of
+    the nested loops. At these table sizes the substring search in C beats a
+    single alternation regex, which has to try every alternative at every
+    position to honour the table order.
+    """
+    seen = set()
+    flat = []
+    for name, keywords in tables:
+        for keyword in keywords:
+            keyword = keyword.lower()
+            if keyword and keyword not in seen:
+                seen.add(keyword)
+                flat.append((keyword, name))
+    return tuple(flat)
+
+def first_match(keywords, text):
+    """Name paired with the first keyword found in text, or None"""
+    for keyword, name in keywords:
+        if keyword in text:
+            return name
+    return None
+
+class CompiledRules:
+    """Lookup tables built once from a rules dict; only the memo caches change afterwards"""
+
+    def __init__(self, rules):
+        self.rules = rules
+
+        self.app_keywords = compile_keywords(rules['app_patterns'].items())
+        self.app_cache = {}  # Window text -> app; titles repeat from tick to tick
+
+        # app -> (confidence_base, {input_pattern: first task listing it})
+        self.profiles = {app: self._compile_profile(profile) for app, profile in rules['application_profiles'].items()}
+        self.default_profile = self._compile_profile(rules['default_profile'])
+
+        # app -> ((keyword, enhancement), ...) in table order
+        self.title_keywords = {
+            app: compile_keywords((enhancement, (keyword,)) for keyword, enhancement in patterns.items())
+            for app, patterns in rules['title_patterns'].items()
+        }
+        self.title_cache = {}
+
+        self.task_steps = {key: tuple(steps) for key, steps in rules['task_steps'].items()}
+        self.automation_potential = {}
+        # Earlier levels win when a task is listed twice
+        for level, tasks in reversed(list(rules['automation_potential'].items())):
+            for task_key in tasks:
+                self.automation_potential[task_key] = level
+
+        self.audio_keywords = compile_keywords(
+            (enhancement, (command,)) for command, enhancement in rules['audio_commands'].items()
+        )
+
+    @staticmethod
+    def _compile_profile(profile):
+        pattern_tasks = {}
+        for task, patterns in profile['tasks'].items():
+            for pattern in patterns:
+                pattern_tasks.setdefault(pattern, task)
+        return profile['confidence_base'], pattern_tasks
+
+    def application(self, text):
+        """Application name for lowercased window text"""
+        app = self.app_cache.get(text)
+        if app is None:
+            app = first_match(self.app_keywords, text) or 'unknown'
+            self._remember(self.app_cache, text, app)
+        return app
+
+    @staticmethod
+    def _remember(cache, key, value):
+        if len(cache) >= 4096:
+            cache.clear()
+        cache[key] = value
+
+    def profile(self, app_name):
+        """(confidence_base, {input_pattern: task}) for an application"""
+        return self.profiles.get(app_name, self.default_profile)
+
+    def title_enhancement(self, app_name, title_lower):
+        keywords = self.title_keywords.get(app_name)
+        if keywords is None:
+            return None
+        key = (app_name, title_lower)
+        if key in self.title_cache:
+            return self.title_cache[key]
+        enhancement = first_match(keywords, title_lower)
+        self._remember(self.title_cache, key, enhancement)
+        return enhancement
+
+    def steps(self, app_name, task):
+        steps = self.task_steps.get(f"{app_name}_{task}")
+        if steps is None:
+            return [f"Working in {app_name}", "Performing various actions"]
+        return list(steps)
+
+    def potential(self, app_name, task):
+        return self.automation_potential.get(f"{app_name}_{task}", "Low")
+
+    def audio_command(self, audio_text):
+        """Enhancement for the first command word (in table order) in a lowercased transcript, or None"""
+        return first_match(self.audio_keywords, audio_text)
+
+class AnalysisRules:
+    """Registry of compiled behavior analysis rules, hot-reloaded from a JSON file
+
+    The file holds any subset of DEFAULT_RULES' sections; each entry in a
+    section replaces or extends the built-in one. The file is checked for
+    changes at most every ANALYSIS_RULES_RELOAD_INTERVAL seconds and a new
+    CompiledRules is swapped in whole, so readers always see one consistent
+    set. A file that fails to parse or compile leaves the previous rules active.
+    """
+
+    def __init__(self, path=ANALYSIS_RULES_FILE, reload_interval=ANALYSIS_RULES_RELOAD_INTERVAL):
+        self.path = Path(path) if path else None
+        self.reload_interval = reload_interval
+        self.last_check = 0.0
+        self.mtime = None
+        self.stats = {'reloads': 0, 'errors': 0}
+        self.current = CompiledRules(DEFAULT_RULES)
+        self.maybe_reload(force=True)
+
+    def maybe_reload(self, force=False):
+        """Current rules, recompiled first if the rules file changed"""
+        now = time.monotonic()
+        if self.path is None or (not force and now - self.last_check < self.reload_interval):
+            return self.current
+        self.last_check = now
+        try:
+            mtime = self.path.stat().st_mtime if self.path.exists() else None
+        except OSError:
+            return self.current
+        if mtime == self.mtime:
+            return self.current
+        self.mtime = mtime
+        if mtime is None:
+            # File removed: back to the built-in rules
+            self.current = CompiledRules(DEFAULT_RULES)
+            return self.current
+
+        try:
+            with open(self.path, 'r') as f:
+                overrides = json.load(f)
+            self.current = CompiledRules(self._merge(overrides))
+            self.stats['reloads'] += 1
+            if not force:
+                print(f"🔄 Analysis rules reloaded from {self.path.name}")
+        except Exception as e:
+            self.stats['errors'] += 1
+            print(f"⚠️ Could not load analysis rules: {e}")
+        return self.current
+
+    @staticmethod
+    def _merge(overrides):
+        rules = {}
+        for section, default in DEFAULT_RULES.items():
+            override = overrides.get(section)
+            if override is None:
+                rules[section] = default
+            elif section == 'default_profile':
+                rules[section] = override
+            else:
+                rules[section] = {**default, **override}
+        unknown = set(overrides) - set(DEFAULT_RULES)
+        if unknown:
+            print(f"⚠️ Ignoring unknown analysis rule sections: {', '.join(sorted(unknown))}")
+        return rules
+
+    def get_stats(self):
+        stats = self.stats.copy()
+        stats['source'] = str(self.path) if self.mtime is not None else 'built-in'
+        return stats
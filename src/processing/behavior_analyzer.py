@@ -1,7 +1,11 @@
 import json
 import re
+import time
 from datetime import datetime, timedelta
 from collections import defaultdict, deque
+from src.config.settings import AUTOMATION_CONFIDENCE_THRESHOLD
+from src.processing.analysis_rules import AnalysisRules
+from src.processing.pattern_detector import PatternDetector
 
 class BehaviorAnalyzer:
     def __init__(self):
@@ -10,12 +14,14 @@ class BehaviorAnalyzer:
         self.session_start = datetime.now()
         self.application_usage = defaultdict(int)
         self.action_sequences = defaultdict(list)
+        self.rules = AnalysisRules()  # Compiled app, title and task tables
+        self.pattern_detector = PatternDetector()  # Frequent action sequences mined from observed_actions
         
-    def analyze_behavior(self, screen_data, audio_data, input_events):
+    def analyze_behavior(self, screen_data, audio_data, input_events, input_stats=None):
         """Enhanced behavior analysis with temporal context"""
         
         # Build comprehensive context
-        context = self._build_enhanced_context(screen_data, audio_data, input_events)
+        context = self._build_enhanced_context(screen_data, audio_data, input_events, input_stats)
         
         # Update session tracking
         self._update_session_tracking(context)
@@ -34,7 +40,7 @@ class BehaviorAnalyzer:
             "session_duration": (datetime.now() - self.session_start).total_seconds()
         }
     
-    def _build_enhanced_context(self, screen_data, audio_data, input_events):
+    def _build_enhanced_context(self, screen_data, audio_data, input_events, input_stats=None):
         """Build comprehensive context with temporal data"""
         current_window = screen_data.get('active_window', 'Unknown') if screen_data else 'Unknown'
         window_title = screen_data.get('window_title', 'Unknown') if screen_data else 'Unknown'
@@ -42,8 +48,11 @@ class BehaviorAnalyzer:
         # Extract application name from window title
         app_name = self._extract_application_name(current_window, window_title)
         
-        # Analyze input patterns
-        input_pattern = self._analyze_input_pattern(input_events)
+        # Analyze input patterns; sliding-window stats see every event since the last tick
+        if input_stats is not None:
+            input_pattern = input_stats.classify()
+        else:
+            input_pattern = self._analyze_input_pattern(input_events)
         
         context = {
             "application": app_name,
@@ -62,34 +71,23 @@ class BehaviorAnalyzer:
         self.observed_actions.append({
             "app": app_name,
             "action": input_pattern,
-            "timestamp": datetime.now(),
+            "time_ns": time.monotonic_ns(),
             "audio": audio_data.get('text', '') if audio_data else ''
         })
         
+        # Mine repeated (app, input pattern, audio intent) sequences
+        intent = ''
+        if context['audio_command'] and context['audio_confidence'] >= 0.5:
+            command = self.rules.current.audio_command(context['audio_command'].lower())
+            intent = command['task_modifier'] if command else ''
+        self.pattern_detector.add((app_name, input_pattern, intent))
+        
         return context
     
     def _extract_application_name(self, current_window, window_title):
         """Extract clean application name from window data"""
-        # Common application patterns
-        app_patterns = {
-            'excel': ['excel', 'xlsx', 'xls'],
-            'word': ['word', 'docx', 'doc'],
-            'chrome': ['chrome', 'google'],
-            'firefox': ['firefox', 'mozilla'],
-            'explorer': ['explorer', 'file', 'folder'],
-            'vscode': ['code', 'visual studio'],
-            'notepad': ['notepad', 'txt'],
-            'powerpoint': ['powerpoint', 'ppt'],
-            'outlook': ['outlook', 'email']
-        }
-        
         combined_text = (current_window + ' ' + window_title).lower()
-        
-        for app_name, patterns in app_patterns.items():
-            if any(pattern in combined_text for pattern in patterns):
-                return app_name
-        
-        return 'unknown'
+        return self.rules.maybe_reload().application(combined_text)
     
     def _analyze_input_pattern(self, input_events):
         """Analyze input events to detect patterns"""
@@ -150,66 +148,15 @@ class BehaviorAnalyzer:
     def _get_application_analysis(self, app_name, window_title, input_pattern):
         """Get detailed analysis based on application and behavior"""
         
-        application_profiles = {
-            'excel': {
-                'tasks': {
-                    'data_entry': ['typing', 'navigating'],
-                    'formula_work': ['typing', 'mixed_input'],
-                    'formatting': ['clicking', 'mixed_input'],
-                    'chart_creation': ['clicking', 'navigating']
-                },
-                'confidence_base': 0.8
-            },
-            'word': {
-                'tasks': {
-                    'document_writing': ['typing', 'mixed_input'],
-                    'editing': ['typing', 'clicking'],
-                    'formatting': ['clicking', 'mixed_input'],
-                    'reviewing': ['scrolling', 'mixed_input']
-                },
-                'confidence_base': 0.7
-            },
-            'chrome': {
-                'tasks': {
-                    'web_browsing': ['navigating', 'scrolling'],
-                    'form_filling': ['typing', 'clicking'],
-                    'research': ['typing', 'mixed_input'],
-                    'shopping': ['clicking', 'scrolling']
-                },
-                'confidence_base': 0.6
-            },
-            'explorer': {
-                'tasks': {
-                    'file_organization': ['clicking', 'navigating'],
-                    'file_search': ['typing', 'mixed_input'],
-                    'copy_move_operations': ['clicking', 'mixed_input']
-                },
-                'confidence_base': 0.75
-            },
-            'vscode': {
-                'tasks': {
-                    'coding': ['typing', 'mixed_input'],
-                    'debugging': ['clicking', 'mixed_input'],
-                    'file_navigation': ['navigating', 'clicking']
-                },
-                'confidence_base': 0.8
-            }
-        }
-        
-        profile = application_profiles.get(app_name, {
-            'tasks': {'general_usage': ['mixed_input']},
-            'confidence_base': 0.5
-        })
+        confidence_base, pattern_tasks = self.rules.current.profile(app_name)
         
         # Find best matching task
-        best_task = 'general_usage'
-        best_confidence = profile['confidence_base']
-        
-        for task, patterns in profile['tasks'].items():
-            if input_pattern in patterns:
-                best_task = task
-                best_confidence = profile['confidence_base'] + 0.15
-                break
+        best_task = pattern_tasks.get(input_pattern)
+        if best_task is None:
+            best_task = 'general_usage'
+            best_confidence = confidence_base
+        else:
+            best_confidence = confidence_base + 0.15
         
         # Enhance with window title keywords
         title_enhancement = self._analyze_window_title(window_title, app_name)
@@ -228,88 +175,26 @@ class BehaviorAnalyzer:
     
     def _analyze_window_title(self, window_title, app_name):
         """Analyze window title for specific task clues"""
-        title_lower = window_title.lower()
-        
-        title_patterns = {
-            'excel': {
-                'budget': {'task': 'budget_management', 'confidence_boost': 0.1},
-                'report': {'task': 'report_generation', 'confidence_boost': 0.1},
-                'sales': {'task': 'sales_analysis', 'confidence_boost': 0.1},
-                'invoice': {'task': 'invoice_processing', 'confidence_boost': 0.15}
-            },
-            'word': {
-                'report': {'task': 'report_writing', 'confidence_boost': 0.1},
-                'resume': {'task': 'resume_creation', 'confidence_boost': 0.1},
-                'letter': {'task': 'letter_writing', 'confidence_boost': 0.1},
-                'proposal': {'task': 'proposal_creation', 'confidence_boost': 0.15}
-            },
-            'chrome': {
-                'google': {'task': 'searching', 'confidence_boost': 0.1},
-                'youtube': {'task': 'video_watching', 'confidence_boost': 0.05},
-                'mail': {'task': 'email_management', 'confidence_boost': 0.1},
-                'shopping': {'task': 'online_shopping', 'confidence_boost': 0.1}
-            }
-        }
-        
-        patterns = title_patterns.get(app_name, {})
-        for keyword, enhancement in patterns.items():
-            if keyword in title_lower:
-                return enhancement
-        
-        return None
+        return self.rules.current.title_enhancement(app_name, window_title.lower())
     
     def _get_task_steps(self, app_name, task):
         """Get typical steps for a task"""
-        task_steps = {
-            'excel_data_entry': ["Open Excel", "Select cells", "Enter data", "Save file"],
-            'excel_formula_work': ["Open Excel", "Select cells", "Enter formulas", "Calculate results", "Save file"],
-            'word_document_writing': ["Open Word", "Type content", "Format text", "Save document"],
-            'chrome_web_browsing': ["Open browser", "Navigate to website", "Scroll content", "Click links"],
-            'explorer_file_organization': ["Open File Explorer", "Select files", "Move/copy files", "Create folders"]
-        }
-        
-        key = f"{app_name}_{task}"
-        return task_steps.get(key, [f"Working in {app_name}", "Performing various actions"])
+        return self.rules.current.steps(app_name, task)
     
     def _get_automation_potential(self, app_name, task):
         """Determine automation potential"""
-        high_potential_tasks = [
-            'excel_data_entry', 'excel_formula_work', 'excel_report_generation',
-            'word_document_writing', 'explorer_file_organization'
-        ]
-        
-        medium_potential_tasks = [
-            'chrome_form_filling', 'chrome_research', 'word_editing'
-        ]
-        
-        task_key = f"{app_name}_{task}"
-        
-        if task_key in high_potential_tasks:
-            return "High"
-        elif task_key in medium_potential_tasks:
-            return "Medium"
-        else:
-            return "Low"
+        return self.rules.current.potential(app_name, task)
     
     def _enhance_with_audio(self, analysis, audio_text, audio_confidence):
         """Enhance analysis with audio commands"""
         if not audio_text or audio_confidence < 0.5:
             return analysis
         
-        audio_commands = {
-            'open': {'task_modifier': 'opening', 'confidence_boost': 0.2},
-            'save': {'task_modifier': 'saving', 'confidence_boost': 0.25},
-            'create': {'task_modifier': 'creating', 'confidence_boost': 0.2},
-            'search': {'task_modifier': 'searching', 'confidence_boost': 0.15},
-            'send': {'task_modifier': 'sending', 'confidence_boost': 0.2}
-        }
-        
-        for command, enhancement in audio_commands.items():
-            if command in audio_text:
-                analysis['current_task'] = f"{analysis['application']}_{enhancement['task_modifier']}"
-                analysis['confidence'] = min(analysis['confidence'] + enhancement['confidence_boost'], 0.95)
-                analysis['audio_triggered'] = True
-                break
+        enhancement = self.rules.current.audio_command(audio_text)
+        if enhancement is not None:
+            analysis['current_task'] = f"{analysis['application']}_{enhancement['task_modifier']}"
+            analysis['confidence'] = min(analysis['confidence'] + enhancement['confidence_boost'], 0.95)
+            analysis['audio_triggered'] = True
         
         return analysis
     
@@ -345,7 +230,39 @@ class BehaviorAnalyzer:
                 "application": analysis['application'],
                 "trigger_conditions": self._get_trigger_conditions(analysis, context)
             }
-        return None
+        return self._mined_pattern_suggestion(analysis)
+    
+    def _mined_pattern_suggestion(self, analysis):
+        """Suggest the frequent action sequence the user has just completed, if any"""
+        pattern = self.pattern_detector.current_pattern()
+        if pattern is None:
+            return None
+        
+        # More repeats, more confidence; capped at 0.8 so a mined sequence is
+        # suggested but never auto-executed (that needs > 0.8)
+        extra_repeats = pattern['occurrences'] - self.pattern_detector.min_support
+        confidence = min(AUTOMATION_CONFIDENCE_THRESHOLD + 0.02 * extra_repeats, 0.8)
+        
+        steps = []
+        for app, input_pattern, intent in pattern['steps']:
+            step = f"{input_pattern.replace('_', ' ').capitalize()} in {app}"
+            steps.append(f"{step} ({intent})" if intent else step)
+        first_app, first_pattern, _ = pattern['steps'][0]
+        
+        return {
+            "workflow_name": "sequence_" + "_".join(f"{app}_{input_pattern}" for app, input_pattern, _ in pattern['steps']),
+            "description": f"Automate repeated sequence: {' -> '.join(steps)} (seen {pattern['occurrences']} times)",
+            "confidence": confidence,
+            "automation_potential": "Medium",
+            "recommended_actions": steps,
+            "application": analysis['application'],
+            "trigger_conditions": [
+                f"Application: {first_app}",
+                f"Input pattern: {first_pattern}"
+            ],
+            "occurrences": pattern['occurrences'],
+            "mined_pattern": True
+        }
     
     def _get_trigger_conditions(self, analysis, context):
         """Get conditions that trigger this workflow"""
@@ -0,0 +1,207 @@
+import threading
+from pathlib import Path
+import numpy as np
+from src.config.settings import (
+    AUDIO_RATE, KWS_COMMAND_WORDS, KWS_MAX_SEGMENT_SECONDS, KWS_MATCH_THRESHOLD,
+    KWS_MARGIN, KWS_LENGTH_RATIO, KWS_MAX_TEMPLATES, KWS_TEMPLATES_FILE
+)
+
+class MFCCExtractor:
+    """NumPy MFCCs: 25 ms Hamming frames every 10 ms, 26 mel bands, 12 cepstra"""
+
+    def __init__(self, sample_rate=AUDIO_RATE, n_fft=512, n_mels=26, n_ceps=12):
+        self.sample_rate = sample_rate
+        self.frame_length = int(0.025 * sample_rate)
+        self.hop = int(0.010 * sample_rate)
+        self.n_fft = n_fft
+        self.window = np.hamming(self.frame_length).astype(np.float32)
+        self.mel_filters = self._mel_filterbank(n_mels)
+        # DCT-II basis without c0, so overall loudness does not matter
+        k = np.arange(1, n_ceps + 1)[:, None]
+        n = np.arange(n_mels)[None, :]
+        self.dct = np.cos(np.pi * k * (2 * n + 1) / (2 * n_mels)).astype(np.float32)
+
+    def _mel_filterbank(self, n_mels):
+        def to_mel(hz):
+            return 2595 * np.log10(1 + hz / 700)
+
+        mel_points = np.linspace(to_mel(0), to_mel(self.sample_rate / 2), n_mels + 2)
+        hz_points = 700 * (10 ** (mel_points / 2595) - 1)
+        bins = np.floor((self.n_fft + 1) * hz_points / self.sample_rate).astype(int)
+        filters = np.zeros((n_mels, self.n_fft // 2 + 1), dtype=np.float32)
+        for m in range(1, n_mels + 1):
+            left, center, right = bins[m - 1], bins[m], bins[m + 1]
+            if center > left:
+                filters[m - 1, left:center] = (np.arange(left, center) - left) / (center - left)
+            if right > center:
+                filters[m - 1, center:right] = (right - np.arange(center, right)) / (right - center)
+        return filters
+
+    def extract(self, audio):
+        """MFCC matrix (frames x cepstra) of the voiced part, mean-normalised; None if too short"""
+        audio = np.asarray(audio, dtype=np.float32)
+        if len(audio) < self.frame_length:
+            return None
+        emphasized = np.append(audio[0], audio[1:] - 0.97 * audio[:-1])
+        count = 1 + (len(emphasized) - self.frame_length) // self.hop
+        index = np.arange(self.frame_length)[None, :] + self.hop * np.arange(count)[:, None]
+        frames = emphasized[index] * self.window
+
+        # Drop leading/trailing frames more than 20 dB below the loudest one
+        energy = np.sqrt(np.mean(np.square(frames), axis=1))
+        voiced = np.flatnonzero(energy > 0.1 * energy.max()) if energy.max() > 0 else []
+        if len(voiced) < 5:
+            return None
+        frames = frames[voiced[0]:voiced[-1] + 1]
+
+        power = np.square(np.abs(np.fft.rfft(frames, self.n_fft))) / self.n_fft
+        mel = np.log(np.maximum(power @ self.mel_filters.T, 1e-10))
+        mfcc = mel @ self.dct.T
+        return mfcc - mfcc.mean(axis=0)
+
+def dtw_distance(a, b):
+    """Length-normalised dynamic time warping distance between two feature sequences
+
+    Each row is vectorised: with S the running sum of the row's costs, the
+    horizontal recurrence D[i, j] = c[j] + min(diag/up, D[i, j-1]) becomes
+    S[j] + min over k <= j of (diag/up[k] + c[k] - S[k]).
+    """
+    cost = np.sqrt(((a[:, None, :] - b[None, :, :]) ** 2).sum(axis=2))
+    previous = np.cumsum(cost[0])
+    for i in range(1, len(a)):
+        row = cost[i]
+        best_above = np.empty_like(row)
+        best_above[0] = previous[0]
+        best_above[1:] = np.minimum(previous[1:], previous[:-1])
+        running = np.cumsum(row)
+        previous = running + np.minimum.accumulate(best_above + row - running)
+    return float(previous[-1]) / (len(a) + len(b))
+
+class KeywordSpotter:
+    """Spot the command vocabulary in short utterances without running Whisper
+
+    Templates are MFCC sequences of earlier utterances that full transcription
+    confirmed to be a single command word (self-enrollment), optionally seeded
+    from WAV files. A short utterance whose nearest template is close enough,
+    and clearly closer than any other word's, is reported as that word; anything
+    else escalates to full transcription. With a single word to compare against
+    there is no margin to check, so nothing is answered until at least two
+    words have templates of a matching length.
+    """
+
+    def __init__(self, words=KWS_COMMAND_WORDS, templates_file=KWS_TEMPLATES_FILE, sample_rate=AUDIO_RATE):
+        self.words = [word.lower() for word in words]
+        self.templates_file = Path(templates_file) if templates_file else None
+        self.sample_rate = sample_rate
+        self.max_samples = int(KWS_MAX_SEGMENT_SECONDS * sample_rate)
+        self.extractor = MFCCExtractor(sample_rate)
+        self.templates = {word: [] for word in self.words}
+        self.lock = threading.Lock()
+        self.stats = {'checked': 0, 'spotted': 0, 'escalated': 0, 'enrolled': 0}
+        self._load_templates()
+
+    def spot(self, audio):
+        """Return {'word', 'confidence', 'distance'} for a confident match, else None"""
+        self._count('checked')
+        if not isinstance(audio, np.ndarray) or len(audio) > self.max_samples:
+            self._count('escalated')
+            return None
+        features = self.extractor.extract(audio)
+        with self.lock:
+            templates = {word: list(items) for word, items in self.templates.items() if items}
+        if features is None or not templates:
+            self._count('escalated')
+            return None
+
+        # Templates are single words, so only an utterance about as long as
+        # one can be answered here; "open excel" must not come back as "open"
+        distances = {}
+        for word, items in templates.items():
+            candidates = [dtw_distance(features, template) for template in items
+                          if 1 / KWS_LENGTH_RATIO <= len(template) / len(features) <= KWS_LENGTH_RATIO]
+            if candidates:
+                distances[word] = min(candidates)
+        if not distances:
+            self._count('escalated')
+            return None
+
+        # The absolute threshold alone lets noise through; the margin over
+        # another word is what rejects it, so one candidate word is not enough
+        ranked = sorted(distances.items(), key=lambda item: item[1])
+        if len(ranked) < 2:
+            self._count('escalated')
+            return None
+        word, distance = ranked[0]
+        if distance > KWS_MATCH_THRESHOLD or distance > KWS_MARGIN * ranked[1][1]:
+            self._count('escalated')
+            return None
+
+        self._count('spotted')
+        return {
+            'word': word,
+            'confidence': round(1.0 - 0.5 * distance / KWS_MATCH_THRESHOLD, 3),
+            'distance': distance
+        }
+
+    def enroll(self, audio, text):
+        """Learn a template when Whisper heard exactly one command word in a short utterance"""
+        if not isinstance(audio, np.ndarray) or len(audio) > self.max_samples or not text:
+            return False
+        tokens = [token.strip('.,!?;:"\'').lower() for token in text.split()]
+        tokens = [token for token in tokens if token]
+        if len(tokens) != 1 or tokens[0] not in self.templates:
+            return False
+        features = self.extractor.extract(audio)
+        if features is None:
+            return False
+
+        with self.lock:
+            items = self.templates[tokens[0]]
+            items.append(features.astype(np.float32))
+            del items[:-KWS_MAX_TEMPLATES]
+            self.stats['enrolled'] += 1
+        return True
+
+    def enroll_file(self, wav_path, word):
+        """Seed a template from a recorded WAV of a command word"""
+        import wave
+        with wave.open(str(wav_path), 'rb') as wf:
+            audio = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16).astype(np.float32) / 32768.0
+        return self.enroll(audio, word)
+
+    def save_templates(self):
+        """Persist enrolled templates so spotting works from the start of the next session"""
+        if self.templates_file is None:
+            return
+        with self.lock:
+            arrays = {f"{word}_{i}": template for word, items in self.templates.items()
+                      for i, template in enumerate(items)}
+        if not arrays:
+            return
+        try:
+            np.savez_compressed(self.templates_file, **arrays)
+        except Exception as e:
+            print(f"❌ Error saving keyword templates: {e}")
+
+    def _load_templates(self):
+        if self.templates_file is None or not self.templates_file.exists():
+            return
+        try:
+            with np.load(self.templates_file) as data:
+                for key in sorted(data.files):
+                    word = key.rsplit('_', 1)[0]
+                    if word in self.templates:
+                        self.templates[word].append(data[key])
+        except Exception as e:
+            print(f"⚠️ Could not load keyword templates: {e}")
+
+    def _count(self, key):
+        with self.lock:
+            self.stats[key] += 1
+
+    def get_stats(self):
+        """Get spot/escalation counts and enrolled templates per word"""
+        with self.lock:
+            stats = self.stats.copy()
+            stats['templates'] = {word: len(items) for word, items in self.templates.items()}
+        return stats
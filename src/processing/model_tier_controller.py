@@ -0,0 +1,90 @@
+import time
+from datetime import datetime
+from src.config.settings import (
+    WHISPER_MODEL, WHISPER_MODEL_TIERS, TRANSCRIPTION_LATENCY_BUDGET,
+    TIER_SWITCH_COOLDOWN, TIER_MIN_SAMPLES
+)
+
+# Approximate decode cost relative to "tiny" (from Whisper's published relative speeds)
+TIER_COSTS = {"tiny": 1.0, "base": 2.0, "small": 5.0, "medium": 16.0, "large": 32.0}
+
+class ModelTierController:
+    """Choose the Whisper tier from measured real-time factor, latency and queue depth
+
+    Steps down a tier when transcripts arrive later than the latency budget or
+    decoding falls behind real time, and steps up when the next tier's
+    predicted cost would still leave plenty of headroom with an empty queue.
+    """
+
+    def __init__(self, tiers=WHISPER_MODEL_TIERS, initial=WHISPER_MODEL,
+                 latency_budget=TRANSCRIPTION_LATENCY_BUDGET, cooldown=TIER_SWITCH_COOLDOWN,
+                 min_samples=TIER_MIN_SAMPLES):
+        self.tiers = list(tiers)
+        self.index = self.tiers.index(initial) if initial in self.tiers else 0
+        self.latency_budget = latency_budget
+        self.cooldown = cooldown
+        self.min_samples = min_samples
+
+        self.rtf = None
+        self.latency = None
+        self.samples = 0
+        self.last_switch = time.monotonic()
+        self.switches = []
+
+    @property
+    def tier(self):
+        return self.tiers[self.index]
+
+    def record(self, model_name, duration, elapsed, latency, queue_depth):
+        """Add one measurement; return the new tier if it should change, else None"""
+        if model_name != self.tier or duration <= 0:
+            # Results decoded before the last switch say nothing about this tier
+            return None
+
+        rtf = elapsed / duration
+        self.rtf = rtf if self.rtf is None else 0.7 * self.rtf + 0.3 * rtf
+        self.latency = latency if self.latency is None else 0.7 * self.latency + 0.3 * latency
+        self.samples += 1
+
+        if self.samples < self.min_samples or time.monotonic() - self.last_switch < self.cooldown:
+            return None
+
+        if self.index > 0 and (self.latency > self.latency_budget or self.rtf > 1.0):
+            reason = "latency" if self.latency > self.latency_budget else "rtf"
+            return self._switch(self.index - 1, reason, queue_depth)
+
+        if self.index < len(self.tiers) - 1 and queue_depth == 0:
+            ratio = TIER_COSTS.get(self.tiers[self.index + 1], 1.0) / TIER_COSTS.get(self.tier, 1.0)
+            if self.rtf * ratio < 0.5 and self.latency * ratio < 0.5 * self.latency_budget:
+                return self._switch(self.index + 1, "headroom", queue_depth)
+        return None
+
+    def _switch(self, index, reason, queue_depth):
+        entry = {
+            'timestamp': datetime.now().isoformat(),
+            'from': self.tier,
+            'to': self.tiers[index],
+            'reason': reason,
+            'rtf': round(self.rtf, 3),
+            'latency': round(self.latency, 2),
+            'queue_depth': queue_depth
+        }
+        self.switches.append(entry)
+        print(f"🎚️ Whisper tier {entry['from']} → {entry['to']} ({reason}: RTF {entry['rtf']:.2f}, "
+              f"latency {entry['latency']:.1f}s, queue {queue_depth})")
+
+        self.index = index
+        self.rtf = None
+        self.latency = None
+        self.samples = 0
+        self.last_switch = time.monotonic()
+        return self.tier
+
+    def get_stats(self):
+        """Current tier, smoothed measurements and the switch log"""
+        return {
+            'tier': self.tier,
+            'rtf': self.rtf,
+            'latency': self.latency,
+            'switches': list(self.switches)
+        }
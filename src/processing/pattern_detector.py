@@ -0,0 +1,182 @@
+from collections import deque
+from src.config.settings import (
+    MIN_PATTERN_OCCURRENCES, PATTERN_MAX_LENGTH, PATTERN_MAX_GAP, PATTERN_PRUNE_INTERVAL
+)
+
+# Packing radix: room for 2**20 - 1 distinct actions
+PATTERN_BITS = 20
+PATTERN_BASE = 1 << PATTERN_BITS
+
+def pattern_length(pattern):
+    """Steps in a packed pattern (its leading item is never 0)"""
+    return (pattern.bit_length() - 1) // PATTERN_BITS + 1
+
+class PatternDetector:
+    """Incremental frequent-sequence miner over the observed action stream
+
+    Actions are (app, input pattern, audio intent) tuples. Consecutive
+    identical actions are one step, so holding a state across observation
+    ticks doesn't look like a repeated sequence. When a step arrives, every
+    sequence of 2..max_length steps that ends on it is enumerated. Each gap
+    between consecutive steps may skip up to max_gap other steps. That is at
+    most sum((max_gap + 1) ** k) sequences, a constant, and each is counted
+    with a dict update. Occurrences are counted non-overlapping: an
+    occurrence only counts if it starts after the last counted one ended.
+
+    Rare candidates are pruned with lossy counting. Every prune_interval
+    steps, entries whose count plus possible undercount is no more than the
+    bucket number are dropped. The table stays bounded on endless streams,
+    pruning is amortised O(1) per step, and a reported count falls short of
+    the true one by at most steps / prune_interval.
+    """
+
+    def __init__(self, min_support=MIN_PATTERN_OCCURRENCES, max_length=PATTERN_MAX_LENGTH,
+                 max_gap=PATTERN_MAX_GAP, prune_interval=PATTERN_PRUNE_INTERVAL):
+        self.min_support = min_support
+        self.max_length = max_length
+        self.max_gap = max_gap
+        self.prune_interval = prune_interval
+
+        # Actions are interned to small ints; a pattern is packed into one int,
+        # PATTERN_BASE per step, which hashes and builds faster than a tuple
+        self.item_ids = {}
+        self.items = []
+        self.history = deque(maxlen=(max_length - 1) * (max_gap + 1) + 1)
+        self._build_paths()
+
+        self.counts = {}  # packed pattern -> [count, max undercount, step where the last counted occurrence ended]
+        self.frequent = set()
+        self.active = []  # Frequent patterns ending at the latest step, best first
+        self.steps = 0
+        self.stats = {'actions': 0, 'repeats': 0, 'pruned': 0}
+
+    def add(self, action):
+        """Feed one action; returns the patterns that just became frequent"""
+        self.stats['actions'] += 1
+        item = self.item_ids.get(action)
+        if item is None:
+            item = len(self.items) + 1  # 0 would vanish when packed
+            self.item_ids[action] = item
+            self.items.append(action)
+        if self.history and self.history[-1] == item:
+            self.stats['repeats'] += 1
+            return []
+
+        self.history.append(item)
+        step = self.steps
+        self.steps += 1
+        bucket = step // self.prune_interval + 1
+        counts = self.counts
+        frequent = self.frequent
+        min_support = self.min_support
+        newly_frequent = []
+        active = []
+
+        for pattern, back in self._occurrences_ending_now().items():
+            entry = counts.get(pattern)
+            if entry is None:
+                entry = counts[pattern] = [1, bucket - 1, step]
+            elif step - back > entry[2]:
+                entry[0] += 1
+                entry[2] = step
+            if entry[0] >= min_support:
+                if pattern not in frequent:
+                    frequent.add(pattern)
+                    newly_frequent.append(pattern)
+                active.append(pattern)
+
+        active.sort(key=lambda pattern: (pattern_length(pattern), counts[pattern][0]), reverse=True)
+        self.active = active
+        if self.steps % self.prune_interval == 0:
+            self._prune(bucket)
+        return [self.decode(pattern) for pattern in newly_frequent]
+
+    def _build_paths(self):
+        """Precompute the history positions of every candidate sequence
+
+        The candidates ending at the newest step always sit at the same
+        positions relative to it, so they are laid out once, level by level
+        (level k holds the sequences of k + 2 steps): for each candidate, the
+        history index of its first step, the candidate one level down that it
+        extends, and how many steps back it starts.
+        """
+        size = self.history.maxlen
+        self.levels = []
+        parents = [size - 1]  # History index of the first step of each candidate on the previous level
+        backs = []
+        for level in range(self.max_length - 1):
+            positions, parent_indexes = [], []
+            for parent, start in enumerate(parents):
+                for position in range(max(0, start - 1 - self.max_gap), start):
+                    positions.append(position)
+                    parent_indexes.append(parent)
+            self.levels.append((PATTERN_BASE ** (level + 1), positions, parent_indexes))
+            backs.extend(size - 1 - position for position in positions)
+            parents = positions
+        # Earliest start first, so building a dict keeps each pattern's latest start
+        self.order = sorted(range(len(backs)), key=lambda index: -backs[index])
+        self.ordered_backs = [backs[index] for index in self.order]
+
+    def _occurrences_ending_now(self):
+        """Steps back to the latest start of every gapped sequence of length >= 2 ending now"""
+        history = list(self.history)
+        short = self.history.maxlen - len(history)
+        if short:
+            # Padding items are 0, so padded candidates pack to the same key as
+            # the real candidate they extend and are overridden by it
+            history = [0] * short + history
+        keys = []
+        level_keys = [history[-1]]
+        for scale, positions, parents in self.levels:
+            level_keys = [history[position] * scale + level_keys[parent] for position, parent in zip(positions, parents)]
+            keys += level_keys
+        found = dict(zip([keys[index] for index in self.order], self.ordered_backs))
+        if short:
+            found.pop(history[-1], None)  # The newest step alone, from all-padding candidates
+        return found
+
+    def _prune(self, bucket):
+        rare = [pattern for pattern, entry in self.counts.items() if entry[0] + entry[1] <= bucket]
+        for pattern in rare:
+            del self.counts[pattern]
+            self.frequent.discard(pattern)
+        self.stats['pruned'] += len(rare)
+
+    def decode(self, pattern):
+        """Actions of a packed pattern, first step first"""
+        steps = []
+        while pattern:
+            pattern, item = divmod(pattern, PATTERN_BASE)
+            steps.append(self.items[item - 1])
+        steps.reverse()
+        return steps
+
+    def current_pattern(self):
+        """The longest (then most repeated) frequent pattern ending at the latest action, or None"""
+        if not self.active:
+            return None
+        pattern = self.active[0]
+        return {'steps': self.decode(pattern), 'occurrences': self.counts[pattern][0]}
+
+    def frequent_patterns(self, min_support=None, min_length=2, limit=None):
+        """Frequent patterns, most repeated (then longest) first"""
+        min_support = self.min_support if min_support is None else min_support
+        min_pattern = PATTERN_BASE ** (min_length - 1)  # Smallest packed pattern with min_length steps
+        patterns = [
+            (pattern, entry[0]) for pattern, entry in self.counts.items()
+            if entry[0] >= min_support and pattern >= min_pattern
+        ]
+        patterns.sort(key=lambda item: (item[1], pattern_length(item[0])), reverse=True)
+        if limit is not None:
+            patterns = patterns[:limit]
+        return [{'steps': self.decode(pattern), 'occurrences': count} for pattern, count in patterns]
+
+    def get_stats(self):
+        stats = self.stats.copy()
+        stats.update({
+            'steps': self.steps,
+            'distinct_actions': len(self.items),
+            'tracked_patterns': len(self.counts),
+            'frequent_patterns': len(self.frequent)
+        })
+        return stats
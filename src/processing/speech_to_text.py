@@ -1,18 +1,135 @@
-import whisper
 import os
+import time
+import threading
 import numpy as np
 from datetime import datetime
-from src.config.settings import WHISPER_MODEL
+from src.config.settings import WHISPER_MODEL, VAD_ENABLED, TRANSCRIPT_CACHE_ENABLED, TRANSCRIPT_CACHE_PERSIST
+from src.processing.voice_activity import VoiceActivityDetector
+from src.processing.transcript_cache import TranscriptCache
+from src.observation.audio_resampler import resample
+
+WHISPER_WINDOW_SAMPLES = 30 * 16000  # Whisper decodes 30 s windows of 16 kHz audio
 
 class SpeechToText:
-    def __init__(self):
-        print("🔄 Loading Whisper model...")
+    def __init__(self, model_name=WHISPER_MODEL, load_async=True):
+        self.model = None
+        self.model_name = model_name
+        self.models = {}  # Loaded tiers, kept so switching back is instant
+        self.switching_to = None
+        # model and model_name change together under this lock; readers take
+        # both at once through current_model()
+        self.switch_lock = threading.Lock()
+        
+        # Model loading runs in the background so startup is not blocked
+        self.load_state = "pending"  # pending, loading, ready, failed
+        self.load_progress = 0.0
+        self.load_seconds = None
+        self.model_ready = threading.Event()
+        
+        # Drop silence and keyboard noise before it reaches Whisper
+        self.vad = VoiceActivityDetector() if VAD_ENABLED else None
+        
+        # Repeated ambient audio and silence are answered from the cache
+        self.cache = None
+        if TRANSCRIPT_CACHE_ENABLED:
+            self.cache = TranscriptCache() if TRANSCRIPT_CACHE_PERSIST else TranscriptCache(persist_path=None)
+        
+        if load_async:
+            self.start_loading()
+        else:
+            self._load_model()
+
+    def start_loading(self):
+        """Load the Whisper model on a background thread"""
+        if self.load_state != "pending":
+            return
+        self.load_state = "loading"
+        threading.Thread(target=self._load_model, name="whisper-loader", daemon=True).start()
+
+    def _load_model(self):
+        """Import Whisper and load weights, updating state and progress"""
+        start = time.perf_counter()
+        self.load_state = "loading"
+        print(f"🔄 Loading Whisper model '{self.model_name}' in background...")
         try:
-            self.model = whisper.load_model(WHISPER_MODEL)
-            print("✅ Whisper model loaded!")
+            # Importing whisper pulls in torch, which alone takes seconds
+            self.load_progress = 0.1
+            import whisper
+            self.load_progress = 0.4
+            model = whisper.load_model(self.model_name)
+            with self.switch_lock:
+                self.model = model
+                self.models[self.model_name] = model
+            self.load_progress = 1.0
+            self.load_state = "ready"
+            self.load_seconds = time.perf_counter() - start
+            print(f"✅ Whisper model loaded in {self.load_seconds:.1f}s!")
         except Exception as e:
             print(f"❌ Failed to load Whisper model: {e}")
             self.model = None
+            self.load_state = "failed"
+        finally:
+            self.model_ready.set()
+
+    def current_model(self):
+        """The (model, model_name) pair serving right now"""
+        with self.switch_lock:
+            return self.model, self.model_name
+
+    def request_model(self, model_name):
+        """Switch to another model tier; the current one keeps serving until it has loaded"""
+        if not self.model_ready.is_set():
+            return
+        with self.switch_lock:
+            if model_name in (self.model_name, self.switching_to):
+                return
+            loaded = model_name in self.models
+            if loaded:
+                self.model, self.model_name = self.models[model_name], model_name
+                self.switching_to = None  # A tier still loading no longer wanted
+            else:
+                self.switching_to = model_name
+        if loaded:
+            print(f"🔀 Whisper model switched to '{model_name}'")
+        else:
+            threading.Thread(target=self._load_tier, args=(model_name,), name="whisper-tier-loader", daemon=True).start()
+
+    def _load_tier(self, model_name):
+        start = time.perf_counter()
+        try:
+            import whisper
+            model = whisper.load_model(model_name)
+        except Exception as e:
+            print(f"❌ Failed to load Whisper model '{model_name}': {e}")
+            model = None
+        with self.switch_lock:
+            wanted = self.switching_to == model_name
+            if wanted:
+                self.switching_to = None
+            if model is None:
+                return
+            self.models[model_name] = model
+            if wanted:
+                self.model, self.model_name = model, model_name
+        if wanted:
+            print(f"🔀 Whisper model switched to '{model_name}' (loaded in {time.perf_counter() - start:.1f}s)")
+
+    def is_ready(self):
+        """True once loading has finished (successfully or not)"""
+        return self.model_ready.is_set()
+
+    def wait_until_ready(self, timeout=None):
+        """Block until the model has finished loading"""
+        return self.model_ready.wait(timeout)
+
+    def get_load_status(self):
+        """Get loading state and progress for the GUI/console"""
+        return {
+            'state': self.load_state,
+            'progress': self.load_progress,
+            'model': self.model_name,
+            'seconds': self.load_seconds
+        }
 
     def _load_audio_without_ffmpeg(self, filename):
         """Load audio directly from WAV file without FFmpeg"""
@@ -23,24 +140,12 @@ class SpeechToText:
                 audio_data = wf.readframes(wf.getnframes())
                 
                 # Convert to numpy array
-                audio = np.frombuffer(audio_data, dtype=np.int16).astype(np.float32) / 32768.0
+                audio = np.multiply(np.frombuffer(audio_data, dtype=np.int16), np.float32(1 / 32768.0), dtype=np.float32)
                 
-                # Resample if needed (Whisper expects 16kHz)
+                # Resample if needed (Whisper expects 16kHz), chunk by chunk
                 sample_rate = wf.getframerate()
                 if sample_rate != 16000:
-                    try:
-                        from scipy import signal
-                        num_samples = int(len(audio) * 16000 / sample_rate)
-                        audio = signal.resample(audio, num_samples)
-                    except ImportError:
-                        # Fallback: simple resampling
-                        ratio = 16000 / sample_rate
-                        new_length = int(len(audio) * ratio)
-                        audio = np.interp(
-                            np.linspace(0, len(audio)-1, new_length),
-                            np.arange(len(audio)),
-                            audio
-                        )
+                    audio = resample(audio, sample_rate, 16000)
                 
                 return audio
         except Exception as e:
@@ -56,17 +161,51 @@ class SpeechToText:
         except Exception as e:
             print(f"Cleanup error: {e}")
 
-    def transcribe_audio(self, audio_path, cleanup=True, conversation_context=None):
-        """Transcribe audio file to text with conversation context"""
+    def transcribe_audio(self, audio_source, cleanup=True, conversation_context=None):
+        """Transcribe a WAV path or 16 kHz float32 array to text with conversation context
+
+        The result's 'model' names the tier that produced it.
+        """
+        # Audio that arrives during loading waits here rather than being dropped
+        self.model_ready.wait()
+        # One model for the whole call, even if the tier switches meanwhile
+        model, model_name = self.current_model()
+        result = self._transcribe_audio(model, model_name, audio_source, cleanup, conversation_context)
+        result["model"] = model_name
+        return result
+
+    def _transcribe_audio(self, model, model_name, audio_source, cleanup, conversation_context):
+        # Streamed segments arrive as arrays and never touch the filesystem
+        audio_path = None if isinstance(audio_source, np.ndarray) else audio_source
         try:
-            if not os.path.exists(audio_path) or self.model is None:
+            if model is None or (audio_path is not None and not os.path.exists(audio_path)):
                 return {"text": "", "confidence": 0.0}
 
-            # Load audio without FFmpeg
-            audio = self._load_audio_without_ffmpeg(audio_path)
+            if audio_path is None:
+                audio = audio_source
+            else:
+                # Load audio without FFmpeg
+                audio = self._load_audio_without_ffmpeg(audio_path)
             if audio is None:
                 return {"text": "", "confidence": 0.0}
 
+            cache_key = self.cache.key(audio, model_name) if self.cache is not None else None
+            cached = self._cached_result(cache_key, conversation_context)
+            if cached is not None:
+                if cleanup and audio_path is not None:
+                    self._cleanup_audio_file(audio_path)
+                return cached
+
+            # Skip non-speech segments and trim leading/trailing silence
+            if self.vad is not None:
+                audio = self.vad.process(audio)
+                if audio is None:
+                    if cache_key:
+                        self.cache.put(cache_key, "", skipped=True)
+                    if cleanup and audio_path is not None:
+                        self._cleanup_audio_file(audio_path)
+                    return {"text": "", "confidence": 0.0, "skipped": True}
+
             # Transcribe with context hints if available
             if conversation_context and len(conversation_context) > 0:
                 # Use recent context to improve transcription
@@ -75,23 +214,134 @@ class SpeechToText:
                 print(f"🔍 Using context: {context_hint[:100]}...")
             
             # Transcribe
-            result = self.model.transcribe(audio)
+            result = model.transcribe(audio)
             text = result["text"].strip()
+            if cache_key:
+                self.cache.put(cache_key, text)
             
             # Clean up audio file if requested
-            if cleanup:
+            if cleanup and audio_path is not None:
                 self._cleanup_audio_file(audio_path)
 
-            return {
-                "text": text,
-                "confidence": 0.8 if text else 0.0,
-                "timestamp": datetime.now().isoformat(),
-                "has_context": conversation_context is not None and len(conversation_context) > 0
-            }
+            return self._build_result(text, conversation_context)
 
         except Exception as e:
             print(f"Transcription error: {e}")
             # Still try to clean up on error
-            if cleanup:
+            if cleanup and audio_path is not None:
                 self._cleanup_audio_file(audio_path)
-            return {"text": "", "confidence": 0.0}
\ No newline at end of file
+            return {"text": "", "confidence": 0.0}
+
+    def _cached_result(self, cache_key, conversation_context):
+        """Result for a segment transcribed before, or None on a miss"""
+        if not cache_key:
+            return None
+        entry = self.cache.get(cache_key)
+        if entry is None:
+            return None
+        if entry['skipped']:
+            return {"text": "", "confidence": 0.0, "skipped": True, "cached": True}
+        result = self._build_result(entry['text'], conversation_context)
+        result["cached"] = True
+        return result
+
+    def _build_result(self, text, conversation_context):
+        return {
+            "text": text,
+            "confidence": 0.8 if text else 0.0,
+            "timestamp": datetime.now().isoformat(),
+            "has_context": conversation_context is not None and len(conversation_context) > 0
+        }
+
+    def transcribe_batch(self, audio_sources, cleanup=True, conversation_context=None):
+        """Transcribe several segments with one batched decode; results keep input order"""
+        self.model_ready.wait()
+        model, model_name = self.current_model()
+        results = [{"text": "", "confidence": 0.0} for _ in audio_sources]
+        if model is None:
+            return self._tag_model(results, model_name)
+
+        batch_indices = []
+        batch_audio = []
+        batch_keys = []
+        for index, audio_source in enumerate(audio_sources):
+            audio_path = None if isinstance(audio_source, np.ndarray) else audio_source
+            if audio_path is None:
+                audio = audio_source
+            else:
+                audio = self._load_audio_without_ffmpeg(audio_path) if os.path.exists(audio_path) else None
+                if cleanup:
+                    self._cleanup_audio_file(audio_path)
+            if audio is None:
+                continue
+
+            cache_key = self.cache.key(audio, model_name) if self.cache is not None else None
+            cached = self._cached_result(cache_key, conversation_context)
+            if cached is not None:
+                results[index] = cached
+                continue
+
+            if self.vad is not None:
+                audio = self.vad.process(audio)
+                if audio is None:
+                    results[index]["skipped"] = True
+                    if cache_key:
+                        self.cache.put(cache_key, "", skipped=True)
+                    continue
+
+            if len(audio) > WHISPER_WINDOW_SAMPLES:
+                # Longer than one Whisper window: let transcribe() chunk it
+                try:
+                    text = model.transcribe(audio)["text"].strip()
+                    results[index] = self._build_result(text, conversation_context)
+                    if cache_key:
+                        self.cache.put(cache_key, text)
+                except Exception as e:
+                    print(f"Transcription error: {e}")
+                continue
+
+            batch_indices.append(index)
+            batch_audio.append(audio)
+            batch_keys.append(cache_key)
+
+        if batch_audio:
+            try:
+                texts = self._decode_batch(model, batch_audio)
+            except Exception as e:
+                print(f"Batched transcription error: {e}, decoding one by one")
+                texts = [model.transcribe(audio)["text"].strip() for audio in batch_audio]
+            for index, text, cache_key in zip(batch_indices, texts, batch_keys):
+                results[index] = self._build_result(text, conversation_context)
+                if cache_key:
+                    self.cache.put(cache_key, text)
+
+        return self._tag_model(results, model_name)
+
+    @staticmethod
+    def _tag_model(results, model_name):
+        for result in results:
+            result["model"] = model_name
+        return results
+
+    def _decode_batch(self, model, batch_audio):
+        """Pad each segment to one 30 s window, stack log-mel features and decode together"""
+        import torch
+        import whisper
+
+        n_mels = model.dims.n_mels
+        mel = torch.stack([
+            whisper.log_mel_spectrogram(
+                whisper.pad_or_trim(torch.from_numpy(np.ascontiguousarray(audio, dtype=np.float32))),
+                n_mels=n_mels
+            )
+            for audio in batch_audio
+        ]).to(model.device)
+
+        options = whisper.DecodingOptions(fp16=model.device.type == "cuda", without_timestamps=True)
+        decoded = whisper.decode(model, mel, options)
+
+        # Same no-speech rule as whisper.transcribe()
+        return [
+            "" if result.no_speech_prob > 0.6 and result.avg_logprob < -1.0 else result.text.strip()
+            for result in decoded
+        ]
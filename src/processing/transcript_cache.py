@@ -0,0 +1,104 @@
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+import numpy as np
+from src.config.settings import TRANSCRIPT_CACHE_SIZE, TRANSCRIPT_CACHE_FILE, TRANSCRIPT_CACHE_QUANT_STEP
+
+class TranscriptCache:
+    """Bounded LRU of transcripts keyed by a fingerprint of the PCM samples
+
+    Samples are quantised to TRANSCRIPT_CACHE_QUANT_STEP before hashing, so
+    near-silent segments (everything below half a step) share one key and
+    bit-identical repeats hit exactly. VAD-skipped segments are cached too.
+    """
+
+    def __init__(self, max_entries=TRANSCRIPT_CACHE_SIZE, persist_path=TRANSCRIPT_CACHE_FILE, collect_new=False):
+        self.max_entries = max_entries
+        self.persist_path = Path(persist_path) if persist_path else None
+        self.entries = OrderedDict()
+        # Worker processes don't write the file; they hand new entries to the owner
+        self.collect_new = collect_new
+        self.new_entries = []
+        self.lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+        self._load()
+
+    def key(self, audio, model_name):
+        """Fingerprint of a float32 segment for a given model"""
+        quantized = np.clip(np.rint(audio / TRANSCRIPT_CACHE_QUANT_STEP), -127, 127).astype(np.int8)
+        digest = hashlib.blake2b(quantized.tobytes(), digest_size=16)
+        digest.update(model_name.encode())
+        return f"{digest.hexdigest()}:{len(audio)}"
+
+    def get(self, key):
+        """Cached {'text', 'skipped'} for a key, or None (counts a hit or miss)"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+            self.entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return dict(entry)
+
+    def put(self, key, text, skipped=False):
+        with self.lock:
+            self.entries[key] = {'text': text, 'skipped': skipped}
+            self.entries.move_to_end(key)
+            if self.collect_new:
+                self.new_entries.append([key, text, skipped])
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.stats['evictions'] += 1
+
+    def drain_new(self):
+        """[key, text, skipped] rows put since the last call (with collect_new)"""
+        with self.lock:
+            rows, self.new_entries = self.new_entries, []
+        return rows
+
+    def merge(self, rows):
+        """Add rows drained from another process's cache"""
+        for key, text, skipped in rows:
+            self.put(key, text, skipped)
+
+    def save(self):
+        """Write entries to disk in LRU order so the next session starts warm
+
+        Written to a temporary file and renamed over the old one, so a reader
+        never sees a half-written file.
+        """
+        if self.persist_path is None:
+            return
+        with self.lock:
+            rows = [[key, entry['text'], entry['skipped']] for key, entry in self.entries.items()]
+        temp_path = self.persist_path.with_name(f"{self.persist_path.name}.{os.getpid()}.tmp")
+        try:
+            with open(temp_path, 'w') as f:
+                json.dump(rows, f)
+            os.replace(temp_path, self.persist_path)
+        except Exception as e:
+            print(f"❌ Error saving transcript cache: {e}")
+
+    def _load(self):
+        if self.persist_path is None or not self.persist_path.exists():
+            return
+        try:
+            with open(self.persist_path, 'r') as f:
+                rows = json.load(f)
+            for key, text, skipped in rows[-self.max_entries:]:
+                self.entries[key] = {'text': text, 'skipped': skipped}
+        except Exception as e:
+            print(f"⚠️ Could not load transcript cache: {e}")
+
+    def get_stats(self):
+        """Get hit/miss counts and current size"""
+        with self.lock:
+            stats = self.stats.copy()
+            stats['entries'] = len(self.entries)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_ratio'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
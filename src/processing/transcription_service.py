@@ -0,0 +1,399 @@
+import queue
+import threading
+import time
+import wave
+import multiprocessing
+from collections import deque
+from datetime import datetime
+import numpy as np
+from src.config.settings import (
+    AUDIO_RATE, WHISPER_MODEL, TRANSCRIPTION_WORKERS, TRANSCRIPTION_BATCH_SIZE, KWS_ENABLED,
+    WHISPER_ADAPTIVE, TRANSCRIPT_CACHE_ENABLED, TRANSCRIPT_CACHE_PERSIST
+)
+from src.processing.speech_to_text import SpeechToText
+from src.processing.keyword_spotter import KeywordSpotter
+from src.processing.model_tier_controller import ModelTierController
+from src.processing.transcript_cache import TranscriptCache
+
+def audio_duration(audio_source):
+    """Length in seconds of a float32 16 kHz segment or a WAV file"""
+    if isinstance(audio_source, np.ndarray):
+        return len(audio_source) / AUDIO_RATE
+    try:
+        with wave.open(audio_source, 'rb') as wf:
+            return wf.getnframes() / wf.getframerate()
+    except Exception:
+        return 0.0
+
+def next_batch(task_queue, batch_size):
+    """Block for one task, then take whatever else is already queued up to batch_size
+
+    Returns (tasks, stop) where stop is True if the shutdown sentinel was seen.
+    """
+    task = task_queue.get()
+    if task is None:
+        return [], True
+    tasks = [task]
+    while len(tasks) < batch_size:
+        try:
+            task = task_queue.get_nowait()
+        except queue.Empty:
+            break
+        if task is None:
+            return tasks, True
+        tasks.append(task)
+    return tasks, False
+
+def transcribe_tasks(stt, tasks):
+    """Transcribe a batch of (seq, audio, context, captured_at) tasks on the current tier
+
+    Returns (seq, result, duration, elapsed) per task, with the batch time
+    shared out by audio length.
+    """
+    durations = [audio_duration(audio) for _, audio, _, _ in tasks]
+    context = tasks[-1][2]
+    start = time.perf_counter()
+    try:
+        if len(tasks) == 1:
+            results = [stt.transcribe_audio(tasks[0][1], cleanup=True, conversation_context=context)]
+        else:
+            results = stt.transcribe_batch([audio for _, audio, _, _ in tasks], cleanup=True,
+                                           conversation_context=context)
+    except Exception as e:
+        print(f"Transcription worker error: {e}")
+        results = [{"text": "", "confidence": 0.0, "model": stt.current_model()[1]} for _ in tasks]
+    elapsed = time.perf_counter() - start
+
+    total_duration = sum(durations)
+    completed = []
+    for (seq, _, _, captured_at), result, duration in zip(tasks, results, durations):
+        result['segment_timestamp'] = captured_at
+        share = duration / total_duration if total_duration else 1 / len(tasks)
+        completed.append((seq, result, duration, elapsed * share))
+    return completed
+
+def _transcription_worker(worker_id, model_name, task_queue, result_queue, batch_size, tier):
+    """Worker process entry point: own model, blocking task queue
+
+    tier is a shared byte string holding the tier the service wants; it is
+    checked before each batch, and the current model keeps decoding until
+    the new one has loaded.
+    """
+    stt = SpeechToText(model_name, load_async=False)
+    if stt.cache is not None:
+        # The main process owns the cache file; new entries go back with each result
+        stt.cache.collect_new = True
+    result_queue.put(('status', worker_id, stt.get_load_status(), None))
+    stop = False
+    while not stop:
+        tasks, stop = next_batch(task_queue, batch_size)
+        if not tasks:
+            continue
+        stt.request_model(tier.value.decode())
+        for payload in transcribe_tasks(stt, tasks):
+            worker_stats = {
+                'vad': stt.vad.get_stats() if stt.vad else None,
+                'cache': stt.cache.get_stats() if stt.cache else None,
+                'cache_entries': stt.cache.drain_new() if stt.cache else []
+            }
+            result_queue.put(('result', worker_id, payload, worker_stats))
+
+class TranscriptionService:
+    """Transcribe queued audio on dedicated workers and deliver results in order
+
+    With one worker a thread shares an in-process SpeechToText (keeping its
+    background model load). With more, each worker is a separate process with
+    its own model so decoding scales across cores.
+    """
+
+    def __init__(self, on_result=None, workers=TRANSCRIPTION_WORKERS, model_name=WHISPER_MODEL,
+                 batch_size=TRANSCRIPTION_BATCH_SIZE):
+        self.on_result = on_result
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.model_name = model_name
+        self.use_processes = self.workers > 1
+
+        # In-process model only in thread mode; worker processes load their own
+        self.speech_to_text = None if self.use_processes else SpeechToText(model_name)
+
+        # In process mode this is the only writer of the transcript cache file
+        self.shared_cache = None
+        if self.use_processes and TRANSCRIPT_CACHE_ENABLED and TRANSCRIPT_CACHE_PERSIST:
+            self.shared_cache = TranscriptCache()
+
+        # Step between model tiers to keep transcripts inside the latency budget
+        self.tier_controller = ModelTierController(initial=model_name) if WHISPER_ADAPTIVE else None
+        self.model_tier = self.tier_controller.tier if self.tier_controller else model_name
+        self.submit_times = {}
+        self.ready_at = None
+
+        # Short command words can be answered without Whisper
+        self.keyword_spotter = KeywordSpotter() if KWS_ENABLED else None
+        self.enroll_candidates = {}
+
+        if self.use_processes:
+            self.mp = multiprocessing.get_context("spawn")
+            self.task_queue = self.mp.Queue()
+            self.result_queue = self.mp.Queue()
+            # Tier changes reach the workers here rather than with each task
+            self.shared_tier = self.mp.Array('c', 32)
+            self.shared_tier.value = self.model_tier.encode()
+        else:
+            self.task_queue = queue.Queue()
+        self.threads = []
+        self.processes = []
+
+        # Results are released strictly in submission order
+        self.lock = threading.Lock()
+        self.next_seq = 0
+        self.next_delivery = 0
+        self.pending_results = {}
+        self.ready_results = deque()
+        self.delivering = False
+        self.tier_lock = threading.Lock()
+
+        self.worker_status = {}
+        self.worker_vad_stats = {}
+        self.worker_cache_stats = {}
+        self.metrics = {
+            'submitted': 0,
+            'completed': 0,
+            'audio_seconds': 0.0,
+            'processing_seconds': 0.0,
+            'last_rtf': 0.0
+        }
+
+    def start(self):
+        """Start the workers"""
+        if self.use_processes:
+            for worker_id in range(self.workers):
+                process = self.mp.Process(
+                    target=_transcription_worker,
+                    args=(worker_id, self.model_name, self.task_queue, self.result_queue, self.batch_size,
+                          self.shared_tier),
+                    daemon=True
+                )
+                process.start()
+                self.processes.append(process)
+            collector = threading.Thread(target=self._collect_results, name="transcription-collector", daemon=True)
+            collector.start()
+            self.threads.append(collector)
+        else:
+            worker = threading.Thread(target=self._thread_worker, name="transcription-worker", daemon=True)
+            worker.start()
+            self.threads.append(worker)
+
+    def stop(self):
+        """Stop workers after the segments already queued"""
+        for _ in range(self.workers if self.use_processes else len(self.threads)):
+            self.task_queue.put(None)
+        for process in self.processes:
+            process.join(timeout=5)
+        if self.use_processes:
+            self.result_queue.put(None)
+        for thread in self.threads:
+            thread.join(timeout=5)
+        self.threads = []
+        self.processes = []
+        if self.speech_to_text is not None and self.speech_to_text.cache is not None:
+            self.speech_to_text.cache.save()
+        if self.shared_cache is not None:
+            self.shared_cache.save()
+        if self.keyword_spotter is not None:
+            self.keyword_spotter.save_templates()
+
+    def submit(self, audio, conversation_context=None, captured_at=None):
+        """Queue a segment for transcription and return its sequence number
+
+        captured_at (ISO time the segment was recorded, default now) comes
+        back on the result as 'segment_timestamp'.
+        """
+        if captured_at is None:
+            captured_at = datetime.now().isoformat()
+        with self.lock:
+            seq = self.next_seq
+            self.next_seq += 1
+            self.metrics['submitted'] += 1
+            self.submit_times[seq] = time.perf_counter()
+
+        if self.keyword_spotter is not None:
+            start = time.perf_counter()
+            # Only single-word-length utterances can match, so the spotted
+            # word is the whole utterance, not the start of a longer command
+            spotted = self.keyword_spotter.spot(audio)
+            if spotted:
+                result = {
+                    "text": spotted['word'],
+                    "confidence": spotted['confidence'],
+                    "timestamp": datetime.now().isoformat(),
+                    "has_context": bool(conversation_context),
+                    "keyword_spotted": True,
+                    "segment_timestamp": captured_at
+                }
+                self._deliver(seq, result, audio_duration(audio), time.perf_counter() - start)
+                return seq
+            if isinstance(audio, np.ndarray) and len(audio) <= self.keyword_spotter.max_samples:
+                # Learn from whatever Whisper makes of this short utterance
+                with self.lock:
+                    self.enroll_candidates[seq] = audio
+
+        self.task_queue.put((seq, audio, conversation_context, captured_at))
+        return seq
+
+    def _thread_worker(self):
+        stop = False
+        while not stop:
+            tasks, stop = next_batch(self.task_queue, self.batch_size)
+            if not tasks:
+                continue
+            for payload in transcribe_tasks(self.speech_to_text, tasks):
+                self._deliver(*payload)
+
+    def _collect_results(self):
+        while True:
+            message = self.result_queue.get()
+            if message is None:
+                break
+            kind, worker_id, payload, worker_stats = message
+            if kind == 'status':
+                self.worker_status[worker_id] = payload
+                continue
+            if worker_stats['vad'] is not None:
+                self.worker_vad_stats[worker_id] = worker_stats['vad']
+            if worker_stats['cache'] is not None:
+                self.worker_cache_stats[worker_id] = worker_stats['cache']
+            if self.shared_cache is not None and worker_stats['cache_entries']:
+                self.shared_cache.merge(worker_stats['cache_entries'])
+            self._deliver(*payload)
+
+    def _deliver(self, seq, result, duration, elapsed):
+        """Buffer out-of-order results and hand them on in sequence
+
+        The lock only covers the bookkeeping: on_result and the tier update
+        run after it is released, so a callback may call get_metrics() or
+        submit() again. Whichever thread finds no delivery in progress drains
+        the ready queue, which keeps on_result calls in order and one at a time.
+        """
+        with self.lock:
+            enroll_audio = self.enroll_candidates.pop(seq, None)
+            submitted_at = self.submit_times.pop(seq, None)
+            self.metrics['completed'] += 1
+            self.metrics['audio_seconds'] += duration
+            self.metrics['processing_seconds'] += elapsed
+            if duration > 0:
+                self.metrics['last_rtf'] = elapsed / duration
+            queue_depth = self.metrics['submitted'] - self.metrics['completed']
+
+            self.pending_results[seq] = result
+            while self.next_delivery in self.pending_results:
+                self.ready_results.append(self.pending_results.pop(self.next_delivery))
+                self.next_delivery += 1
+            drain = not self.delivering
+            self.delivering = True
+
+        if submitted_at is not None and 'model' in result:
+            self._update_tier(result['model'], duration, elapsed, time.perf_counter() - submitted_at,
+                              submitted_at, queue_depth)
+
+        while drain:
+            with self.lock:
+                if not self.ready_results:
+                    self.delivering = False
+                    break
+                ordered = self.ready_results.popleft()
+            if self.on_result:
+                try:
+                    self.on_result(ordered)
+                except Exception as e:
+                    print(f"❌ Transcript handling error: {e}")
+
+        if enroll_audio is not None:
+            self.keyword_spotter.enroll(enroll_audio, result.get("text", ""))
+
+    def _update_tier(self, model_name, duration, elapsed, latency, submitted_at, queue_depth):
+        """Feed the tier controller (outside the result lock)"""
+        if self.tier_controller is None:
+            return
+        with self.tier_lock:
+            # Segments queued while the model was still loading would look slow
+            if self.ready_at is None:
+                if not self.is_ready():
+                    return
+                self.ready_at = time.perf_counter()
+            if submitted_at < self.ready_at:
+                return
+            tier = self.tier_controller.record(model_name, duration, elapsed, latency, queue_depth)
+            if tier is not None:
+                self.model_tier = tier
+                if self.speech_to_text is not None:
+                    self.speech_to_text.request_model(tier)
+                else:
+                    self.shared_tier.value = tier.encode()
+
+    def get_metrics(self):
+        """Queue depth and real-time factor (processing time / audio time)"""
+        with self.lock:
+            metrics = self.metrics.copy()
+            metrics['reorder_pending'] = len(self.pending_results)
+        metrics['queue_depth'] = metrics['submitted'] - metrics['completed']
+        audio_seconds = metrics['audio_seconds']
+        metrics['rtf'] = metrics['processing_seconds'] / audio_seconds if audio_seconds else 0.0
+        metrics['workers'] = self.workers
+        metrics['model'] = self.model_tier
+        return metrics
+
+    def get_tier_stats(self):
+        """Adaptive tier state and switch log (None when the tier is fixed)"""
+        return self.tier_controller.get_stats() if self.tier_controller else None
+
+    def is_ready(self):
+        """True once every worker has finished loading its model"""
+        if self.speech_to_text is not None:
+            return self.speech_to_text.is_ready()
+        return len(self.worker_status) >= self.workers
+
+    def get_load_status(self):
+        """Model loading state for the GUI/console"""
+        if self.speech_to_text is not None:
+            return self.speech_to_text.get_load_status()
+        loaded = len(self.worker_status)
+        failed = any(status['state'] == 'failed' for status in self.worker_status.values())
+        return {
+            'state': 'failed' if failed else ('ready' if loaded >= self.workers else 'loading'),
+            'progress': loaded / self.workers,
+            'model': self.model_name,
+            'seconds': max((s['seconds'] or 0 for s in self.worker_status.values()), default=None)
+        }
+
+    def get_vad_stats(self):
+        """VAD counters summed over all workers (None when VAD is disabled)"""
+        if self.speech_to_text is not None:
+            return self.speech_to_text.vad.get_stats() if self.speech_to_text.vad else None
+        if not self.worker_vad_stats:
+            return None
+        totals = {}
+        for stats in self.worker_vad_stats.values():
+            for key, value in stats.items():
+                totals[key] = totals.get(key, 0) + value
+        seconds = totals.get('seconds_total', 0)
+        totals['skipped_ratio'] = totals.get('seconds_skipped', 0) / seconds if seconds else 0.0
+        return totals
+
+    def get_cache_stats(self):
+        """Transcript cache hit/miss counters summed over all workers (None when disabled)"""
+        if self.speech_to_text is not None:
+            return self.speech_to_text.cache.get_stats() if self.speech_to_text.cache else None
+        if not self.worker_cache_stats:
+            return None
+        totals = {}
+        for stats in self.worker_cache_stats.values():
+            for key, value in stats.items():
+                totals[key] = totals.get(key, 0) + value
+        lookups = totals['hits'] + totals['misses']
+        totals['hit_ratio'] = totals['hits'] / lookups if lookups else 0.0
+        return totals
+
+    def get_keyword_stats(self):
+        """Keyword spotting counters (None when spotting is disabled)"""
+        return self.keyword_spotter.get_stats() if self.keyword_spotter else None
@@ -0,0 +1,89 @@
+import threading
+import numpy as np
+from src.config.settings import (
+    AUDIO_RATE, VAD_FRAME_MS, VAD_ENERGY_THRESHOLD, VAD_NOISE_RATIO,
+    VAD_ZCR_MAX, VAD_MIN_SPEECH_MS, VAD_PADDING_MS
+)
+
+class VoiceActivityDetector:
+    """Energy + zero-crossing voice activity detection
+
+    A frame counts as speech when its RMS energy clears both an absolute
+    floor and a multiple of the tracked background noise, and its
+    zero-crossing rate is low enough to rule out clicks and hiss (keyboard
+    noise is short and broadband).
+    """
+
+    def __init__(self, sample_rate=AUDIO_RATE, frame_ms=VAD_FRAME_MS):
+        self.sample_rate = sample_rate
+        self.frame_length = int(sample_rate * frame_ms / 1000)
+        self.min_speech_frames = max(1, VAD_MIN_SPEECH_MS // frame_ms)
+        self.padding_frames = VAD_PADDING_MS // frame_ms
+        self.noise_floor = None
+        self.lock = threading.Lock()
+        self.stats = {
+            'segments_total': 0,
+            'segments_skipped': 0,
+            'seconds_total': 0.0,
+            'seconds_skipped': 0.0
+        }
+
+    def frame_features(self, audio):
+        """RMS energy and zero-crossing rate for each whole frame"""
+        count = len(audio) // self.frame_length
+        frames = audio[:count * self.frame_length].reshape(count, self.frame_length)
+        energy = np.sqrt(np.mean(np.square(frames, dtype=np.float32), axis=1))
+        signs = np.signbit(frames)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / self.frame_length
+        return energy, zcr
+
+    def speech_mask(self, audio):
+        """Boolean speech/non-speech decision per frame"""
+        energy, zcr = self.frame_features(audio)
+        if len(energy) == 0:
+            return np.zeros(0, dtype=bool)
+
+        # Track background level from the quietest frames seen. Levels that
+        # already look like speech only creep in, so a long utterance streamed
+        # in short chunks is not absorbed into the floor.
+        quiet = float(np.percentile(energy, 10))
+        with self.lock:
+            if self.noise_floor is None:
+                self.noise_floor = quiet
+            threshold = max(VAD_ENERGY_THRESHOLD, self.noise_floor * VAD_NOISE_RATIO)
+            weight = 0.1 if quiet < threshold else 0.001
+            self.noise_floor = (1 - weight) * self.noise_floor + weight * quiet
+
+        return (energy > threshold) & (zcr < VAD_ZCR_MAX)
+
+    def process(self, audio):
+        """Trim silence from a segment, or return None when it holds no speech"""
+        mask = self.speech_mask(audio)
+        duration = len(audio) / self.sample_rate
+
+        speech_frames = np.flatnonzero(mask)
+        if len(speech_frames) < self.min_speech_frames:
+            self._record(duration, duration, skipped=True)
+            return None
+
+        start = max(0, speech_frames[0] - self.padding_frames) * self.frame_length
+        end = min(len(audio), (speech_frames[-1] + 1 + self.padding_frames) * self.frame_length)
+        trimmed = audio[start:end]
+        self._record(duration, duration - len(trimmed) / self.sample_rate, skipped=False)
+        return trimmed
+
+    def _record(self, duration, skipped_seconds, skipped):
+        with self.lock:
+            self.stats['segments_total'] += 1
+            self.stats['seconds_total'] += duration
+            self.stats['seconds_skipped'] += skipped_seconds
+            if skipped:
+                self.stats['segments_skipped'] += 1
+
+    def get_stats(self):
+        """Get counts of audio dropped before transcription"""
+        with self.lock:
+            stats = self.stats.copy()
+        total = stats['seconds_total']
+        stats['skipped_ratio'] = stats['seconds_skipped'] / total if total else 0.0
+        return stats
@@ -0,0 +1,36 @@
+import numpy as np
+from src.processing.keyword_spotter import KeywordSpotter
+
+rng = np.random.default_rng(0)
+
+def vowel(f0, formants, n):
+    """Harmonics of f0 shaped by two formant peaks"""
+    t = np.arange(n) / 16000
+    formants = np.array(formants)[:, None]
+    signal = sum(np.exp(-((h * f0 - formants) ** 2).min(axis=0) / (2 * 150 ** 2)) * np.sin(2 * np.pi * h * f0 * t)
+                 for h in range(1, 40) if h * f0 < 7000)
+    return signal / np.abs(signal).max()
+
+def utterance(f0, formants):
+    """Fricative, vowel, fricative: a synthetic one-syllable word of about half a second"""
+    audio = np.concatenate([rng.standard_normal(2500) * 0.5, vowel(f0, formants, 4000), rng.standard_normal(1500) * 0.5])
+    return (0.5 * audio * np.hanning(len(audio)) + 0.01 * rng.standard_normal(len(audio))).astype(np.float32)
+
+def test_non_keyword_escalates_with_one_word_enrolled():
+    spotter = KeywordSpotter(templates_file=None)
+    for _ in range(3):
+        assert spotter.enroll(utterance(120, [700, 1800]), "save")
+
+    # Within the absolute match threshold of "save", but with no other word
+    # to be clearly closer than, it must go to Whisper
+    assert spotter.spot(utterance(120, [650, 1700])) is None
+    assert spotter.spot((0.3 * rng.standard_normal(8000)).astype(np.float32)) is None
+
+def test_keyword_spotted_once_another_word_is_enrolled():
+    spotter = KeywordSpotter(templates_file=None)
+    for _ in range(3):
+        spotter.enroll(utterance(120, [700, 1800]), "save")
+        spotter.enroll(utterance(120, [300, 2300]), "open")
+
+    spotted = spotter.spot(utterance(120, [700, 1800]))
+    assert spotted is not None and spotted['word'] == "save"